@@ -1,4 +1,5 @@
 import sys
+import logging
 from thongssh_gtk.app import main
 
 if __name__ == '__main__':
@@ -6,5 +7,8 @@ if __name__ == '__main__':
     This is the entry point for the PyInstaller bundle.
     It imports the main function from the package and runs it.
     """
+    # Logging is configured by whoever runs the app, same as in thongssh.py
+    logging.basicConfig(level=logging.DEBUG,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
     exit_status = main()
     sys.exit(exit_status)
\ No newline at end of file
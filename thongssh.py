@@ -2,22 +2,18 @@
 
 """
 Точка входа для запуска приложения ThongSSH.
-Этот скрипт обеспечивает правильный запуск приложения как модуля,
-чтобы все относительные импорты внутри пакета 'thongssh_gtk' работали корректно.
+Импортирует пакет 'thongssh_gtk' напрямую, поэтому все относительные
+импорты внутри него работают корректно.
 """
-import runpy
-import os
 import sys
-from gi.repository import Gio
+import logging
 
-# --- Загрузка ресурсов (если они не были загружены приложением) ---
-try:
-    # Находим путь к бинарному файлу ресурсов и загружаем его.
-    resource_path = os.path.join(os.path.dirname(__file__), 'thongssh_gtk', 'thongssh.gresource')
-    resource = Gio.Resource.load(resource_path)
-    Gio.resources_register(resource)
-except GLib.Error:
-    # Ресурсы уже могут быть зарегистрированы, это нормально
-    pass
+if __name__ == "__main__":
+    # ✨ Логирование настраивается только здесь, при запуске приложения.
+    # DEBUG показывает всё, INFO — только важные сообщения.
+    logging.basicConfig(level=logging.DEBUG,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
 
-runpy.run_module("thongssh_gtk.app", run_name="__main__")
\ No newline at end of file
+    # Ресурсы (.gresource) регистрирует само приложение в ThongSSHApp.__init__.
+    from thongssh_gtk.app import main
+    sys.exit(main())
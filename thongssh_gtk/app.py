@@ -4,65 +4,94 @@ import os
 import signal
 import atexit
 import logging
-logging.basicConfig(level=logging.DEBUG,
-                    format='%(asctime)s - %(levelname)s - %(message)s')
 # --- Strict version check ---
+# Only the toolkit is pinned here. Vte and Secret (and the window module that
+# pulls them in) are loaded on activation, so they don't slow down startup.
 try:
     gi.require_version('Gtk', '4.0')
     gi.require_version('Adw', '1')
-    gi.require_version('Vte', '3.91')
-    gi.require_version('Secret', '1') # ✨ For secure password storage
 except ValueError as e:
     logging.basicConfig(level=logging.CRITICAL)
     logging.critical(f"Error: Required libraries not found. {e}")
-    logging.critical("Please ensure you have gir1.2-gtk-4.0, gir1.2-adw-1, and gir1.2-vte-3.91 installed.")
+    logging.critical("Please ensure you have gir1.2-gtk-4.0 and gir1.2-adw-1 installed.")
     logging.shutdown() # Ensure logs are flushed before exit
     sys.exit(1)
 
-from gi.repository import Adw, Gio, Gtk, GdkPixbuf
-from .window import ThongSSHWindow # Keep relative import
+from gi.repository import Adw, Gio, GLib
 from .constants import APP_ID, resource_path # Import our new function
 
+# The registered resource bundle. Gio.Resource.load() already memory-maps the
+# file, so keeping this reference alive is all that's needed to share it.
+_resource = None
+
+def _register_resources():
+    """Loads and registers thongssh.gresource once per process."""
+    global _resource
+    if _resource is not None:
+        return
+    res_path = resource_path("thongssh.gresource") # Use the helper function
+    _resource = Gio.Resource.load(res_path)
+    Gio.resources_register(_resource)
+
 # --- Application Class ---
 class ThongSSHApp(Adw.Application):
     def __init__(self, **kwargs):
         super().__init__(application_id=APP_ID, **kwargs)
         # ✨ Register resources in the constructor, BEFORE creating the window
         try:
-            res_path = resource_path("thongssh.gresource") # Use the helper function
-            Gio.resources_register(Gio.Resource.load(res_path))
-        except gi.repository.GLib.GError:
-            logging.debug("Resources already registered, skipping.")
+            _register_resources()
+        except gi.repository.GLib.GError as e:
+            logging.warning(f"Failed to load resources: {e}")
         self.connect('activate', self.on_activate)
 
     def on_activate(self, app):
         # If the window doesn't exist yet, create it.
         if not self.props.active_window:
+            try:
+                gi.require_version('Vte', '3.91')
+                gi.require_version('Secret', '1') # ✨ For secure password storage
+            except ValueError as e:
+                logging.critical(f"Error: Required libraries not found. {e}")
+                logging.critical("Please ensure you have gir1.2-vte-3.91 and gir1.2-secret-1 installed.")
+                self.quit()
+                return
+            from .window import ThongSSHWindow # Keep relative import
             self.win = ThongSSHWindow(application=self)
         # Present the window. This ensures it's shown correctly on subsequent activations.
         self.props.active_window.present()
 
 
 def main():
-    # ✨ Configure logging
-    # Use DEBUG level to see everything, or INFO for important messages only
-    logging.basicConfig(level=logging.DEBUG,
-                        format='%(asctime)s - %(levelname)s - %(message)s')
-
     @atexit.register
     def kill_all_sessions():
         logging.info("Exiting... Killing all active sessions.")
-        for term, pid in ThongSSHWindow.open_sessions.values():
+        window = getattr(app, 'win', None)
+        if window is None:
+            return # The window was never created, so there are no sessions
+        # VTE starts every child in its own session, so its PID is also the
+        # process group ID. One killpg() takes down sshpass together with ssh.
+        for term, pid in window.open_sessions.values():
             try:
-                os.kill(pid, signal.SIGKILL)
+                os.killpg(pid, signal.SIGKILL)
             except ProcessLookupError:
                 pass
             except TypeError:
                 logging.warning(f"Cannot kill PID: {pid}, it's not an int")
 
     app = ThongSSHApp()
+
+    # atexit handlers don't run if we die from SIGTERM, so quit cleanly instead.
+    def on_sigterm():
+        logging.info("SIGTERM received, quitting...")
+        app.quit()
+        return GLib.SOURCE_REMOVE
+    GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signal.SIGTERM, on_sigterm)
+
     return app.run(sys.argv)
 
 if __name__ == '__main__':
+    # Logging is configured by whoever runs us, not on import
+    logging.basicConfig(level=logging.DEBUG,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
     exit_status = main()
     sys.exit(exit_status)
\ No newline at end of file
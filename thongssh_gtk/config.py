@@ -1,36 +1,60 @@
+import contextlib
 import json
+import mmap
 import os
 import logging
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+
+# orjson is optional: it is much faster than the stdlib json module, but
+# we fall back to json if it's not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # --- Global Constants ---
-CONFIG_DIR = Path.home() / ".config" / "thongssh"
+# Resolved once at import. XDG says relative paths must be ignored.
+_xdg_config_home = os.environ.get("XDG_CONFIG_HOME")
+if not _xdg_config_home or not os.path.isabs(_xdg_config_home):
+    _xdg_config_home = Path.home() / ".config"
+CONFIG_DIR = Path(_xdg_config_home) / "thongssh"
 CONFIG_FILE = CONFIG_DIR / "hosts.json" 
 from gi.repository import GLib
 
-# Default template for a new config file
-DEFAULT_CONFIG_DATA = {
-    "type": "group",
-    "name": "Root",
-    "children": [
-        {
-            "type": "host",
-            "config": {
-                "name": "Example Host",
-                "host": "user@example.com",
-                "port": None,
-                "key_path": None,
-                "compat_old_systems": False,
-                "ssh_options": None,
-                "forward_x": False,
-                "forward_agent": False
+def _default_config():
+    """
+    Builds the template for a brand new config file. Only needed on the very
+    first run, so it isn't built at import, and every caller gets its own copy.
+    """
+    return {
+        "type": "group",
+        "name": "Root",
+        "children": [
+            {
+                "type": "host",
+                "config": {
+                    "name": "Example Host",
+                    "host": "user@example.com",
+                    "port": None,
+                    "key_path": None,
+                    "compat_old_systems": False,
+                    "ssh_options": None,
+                    "forward_x": False,
+                    "forward_agent": False
+                }
             }
-        }
-    ]
-}
+        ]
+    }
+
+# Version of the hosts.json layout. Bump it whenever a field is added to
+# HOST_CONFIG_TEMPLATE (or groups), so old files get migrated once.
+CONFIG_SCHEMA_VERSION = 2
 
 # Template for migration. Add ALL new fields here!
-HOST_CONFIG_TEMPLATE = {
+# Read-only, since the values are shared by every migrated host.
+HOST_CONFIG_TEMPLATE = MappingProxyType({
     "protocol": "ssh",
     "name": None,
     "host": None,
@@ -42,75 +66,166 @@ HOST_CONFIG_TEMPLATE = {
     "forward_agent": False,
     "telnet_binary": False,
     "telnet_local_echo": False,
-}
+})
+_HOST_CONFIG_KEYS = frozenset(HOST_CONFIG_TEMPLATE)
+
+
+def _loads(raw):
+    """Parses JSON bytes read from the config file."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _read_config():
+    """
+    Reads and parses hosts.json through a read-only memory map, so the
+    parser works on the page cache directly instead of a copied buffer.
+    """
+    with open(CONFIG_FILE, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return _loads(b"")  # mmap can't map an empty file
+        flags = mmap.MAP_SHARED | getattr(mmap, 'MAP_POPULATE', 0) # Prefault pages on Linux
+        mm = mmap.mmap(f.fileno(), 0, flags=flags, prot=mmap.PROT_READ)
+        try:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            if orjson is None:
+                return json.loads(mm[:])
+            # The view must be released before the map can be closed.
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+        finally:
+            mm.close()
 
 
-def _recursive_migrate(node):
+def _dumps(data):
+    """Serializes config data to indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=4, ensure_ascii=False).encode('utf-8')
+
+
+def _write_config(data, fsync=True):
+    """Serializes data and atomically writes it to hosts.json."""
+    _write_config_bytes(_dumps(data), fsync)
+
+
+def _write_config_bytes(buf, fsync=True):
+    """
+    Atomically writes already serialized JSON to hosts.json: the bytes go to
+    a temp file in the same directory in one write, which then replaces the
+    config. A crash mid-write can no longer leave a truncated hosts.json behind.
+    """
+    tmp_file = CONFIG_FILE.with_suffix(".json.tmp")
+    # Raw fd, no Python file object. 0o600: hosts.json is nobody else's business.
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        try:
+            view = memoryview(buf)
+            while view:  # os.write() may write less than asked
+                view = view[os.write(fd, view):]
+            if fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_file, CONFIG_FILE)
+    except BaseException:
+        with contextlib.suppress(OSError):  # Don't leave a half-written copy behind
+            os.unlink(tmp_file)
+        raise
+
+
+def _migrate_tree(root):
+    """
+    Fills in missing fields for every node of the config tree, in place.
+    Walks the tree with an explicit stack instead of recursion.
+    Returns True if anything was changed and the file needs to be saved.
+    """
     needs_save = False
-    if node.get("type") == "host":
-        if "config" not in node:
-            node["config"] = {}
-            needs_save = True
-        for key, default_value in HOST_CONFIG_TEMPLATE.items():
-            if key not in node["config"]:
-                node["config"][key] = default_value
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        node_type = node.get("type")
+        if node_type == "host":
+            cfg = node.get("config")
+            if cfg is None:
+                cfg = node["config"] = {}
+                needs_save = True
+            missing = _HOST_CONFIG_KEYS - cfg.keys()
+            if missing:
+                for key in missing:
+                    cfg[key] = HOST_CONFIG_TEMPLATE[key]
+                needs_save = True
+        elif node_type == "group":
+            # ✨ Add 'expanded' field for groups if it doesn't exist
+            if "expanded" not in node:
+                node["expanded"] = True  # Groups are expanded by default
                 needs_save = True
-    elif node.get("type") == "group":
-        # ✨ Add 'expanded' field for groups if it doesn't exist
-        if "expanded" not in node:
-            node["expanded"] = True  # Groups are expanded by default
-            needs_save = True
-
-        if "children" in node:
-            migrated_children = []
-            for child in node["children"]:
-                migrated_child, child_needs_save = _recursive_migrate(child)
-                migrated_children.append(migrated_child)
-                if child_needs_save:
-                    needs_save = True
-            node["children"] = migrated_children
-    return node, needs_save
+            stack.extend(node.get("children", ()))
+    return needs_save
+
+
+@lru_cache(maxsize=1)
+def _default_config_bytes():
+    """The default config, serialized once and reused for every write."""
+    return _dumps(_default_config())
+
+
+def _write_default_config():
+    """Writes a brand new config file and returns its data."""
+    _write_config_bytes(_default_config_bytes())
+    return _default_config()
+
+
+_DIR_READY = False
+
+def ensure_config_dir():
+    """Creates CONFIG_DIR on first use; later calls cost no syscalls."""
+    global _DIR_READY
+    if not _DIR_READY:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        _DIR_READY = True
 
 
 def load_and_migrate_config():
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    ensure_config_dir()
     if not CONFIG_FILE.exists():
         logging.info("Config file not found, creating a new one...")
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(DEFAULT_CONFIG_DATA, f, indent=4)
-        return DEFAULT_CONFIG_DATA
+        return _write_default_config()
 
     try:
-        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _read_config()
 
-        needs_save_after_wrap = False
         if isinstance(data, list):
             logging.info("Old config format (list) detected, wrapping in Root...")
             data = {"type": "group", "name": "Root", "children": data}
-            needs_save_after_wrap = True
-
-        migrated_data, needs_migration_save = _recursive_migrate(data)
+        elif data.get("schema_version") == CONFIG_SCHEMA_VERSION:
+            return data  # Already up to date, no need to walk the tree
 
-        if needs_save_after_wrap or needs_migration_save:
-            logging.info("Updating config file (migration)...")
-            try:
-                with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                    json.dump(migrated_data, f, indent=4, ensure_ascii=False)
-            except Exception as e:
-                logging.error(f"Failed to save migrated config: {e}")
+        # Save even if no field was missing, so the version stamp lets
+        # the next start skip the walk.
+        _migrate_tree(data)
+        data["schema_version"] = CONFIG_SCHEMA_VERSION
+        logging.info("Updating config file (migration)...")
+        try:
+            _write_config(data)
+        except Exception as e:
+            logging.error(f"Failed to save migrated config: {e}")
 
-        return migrated_data
+        return data
     except json.JSONDecodeError:
         logging.error(f"ERROR: Config {CONFIG_FILE} is corrupted. Creating a backup.")
-        os.rename(CONFIG_FILE, f"{CONFIG_FILE}.bak")
-        return load_and_migrate_config()
+        with contextlib.suppress(FileNotFoundError):
+            os.rename(CONFIG_FILE, f"{CONFIG_FILE}.bak")
+        return _write_default_config()  # No retry loop: start fresh
 
 
 def save_config(config_data):
     """Saves the given dictionary to hosts.json."""
+    # The app only ever saves fully migrated trees.
+    config_data["schema_version"] = CONFIG_SCHEMA_VERSION
     try:
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config_data, f, indent=4, ensure_ascii=False)
+        _write_config(config_data)
     except Exception as e:
         logging.error(f"Failed to save config: {e}")
\ No newline at end of file
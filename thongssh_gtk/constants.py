@@ -1,26 +1,33 @@
 import sys
 import os
+from enum import IntEnum
+from functools import lru_cache
 
 APP_ID = "com.example.thongssh"
 
+# PyInstaller creates a temp folder and stores path in _MEIPASS.
+# When bundled, the 'thongssh_gtk' folder is at the root; in development,
+# paths are relative to the thongssh_gtk directory.
+if hasattr(sys, '_MEIPASS'):
+    _BASE = os.path.join(sys._MEIPASS, 'thongssh_gtk')
+else:
+    _BASE = os.path.dirname(__file__)
+
+@lru_cache(maxsize=None)
 def resource_path(relative_path):
     """
     Get absolute path to resource, works for dev and for PyInstaller.
     """
-    # PyInstaller creates a temp folder and stores path in _MEIPASS
-    if hasattr(sys, '_MEIPASS'):
-        # When bundled, the 'thongssh_gtk' folder is at the root.
-        return os.path.join(sys._MEIPASS, 'thongssh_gtk', relative_path)
-
-    # In development, the path is relative to the thongssh_gtk directory
-    return os.path.join(os.path.dirname(__file__), relative_path)
+    return os.path.join(_BASE, relative_path)
 
 # --- КОЛОНКИ TreeStore ---
 # (Имя, Тип, Иконка, Объект данных (config/node))
-(
-    COL_NAME,
-    COL_TYPE,
-    COL_ICON,
-    COL_DATA
-) = range(4)
+class Col(IntEnum):
+    NAME = 0
+    TYPE = 1
+    ICON = 2
+    DATA = 3
+
+# Plain int aliases; per-row callbacks copy them into locals.
+COL_NAME, COL_TYPE, COL_ICON, COL_DATA = map(int, Col)
 # -------------------------
\ No newline at end of file
@@ -1,32 +1,111 @@
 import gi
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
-from gi.repository import Gtk, Adw, GObject, Pango
+from gi.repository import Gtk, Adw, Gio, GLib, GObject, Pango
+import os
+import re
 import stat
+import weakref
+from contextlib import contextmanager
+from functools import cached_property, lru_cache
 
-from .constants import COL_NAME, COL_TYPE
+from .constants import COL_NAME, COL_TYPE, resource_path
 from .colors import COLOR_SCHEMES
-from .settings import DEFAULT_SETTINGS
 from .keyring import KeyringManager
 
 # Placeholder for future internationalization (i18n)
 _ = lambda s: s
 
+def _walk_groups(tree_store):
+    """
+    Yields (display_name, tree_iter, path_string) for every group in the
+    TreeStore, depth-first and in tree order. Uses an explicit stack, and
+    builds the path strings from sibling positions instead of asking GTK.
+    """
+    get_value = tree_store.get_value
+    iter_next = tree_store.iter_next
+    iter_children = tree_store.iter_children
+
+    def children(parent_iter, parent_path, prefix):
+        nodes = []
+        tree_iter = iter_children(parent_iter)
+        index = 0
+        while tree_iter:
+            if get_value(tree_iter, COL_TYPE) == "group":
+                path = f"{parent_path}:{index}" if parent_path else str(index)
+                nodes.append((tree_iter.copy(), path, prefix)) # Copy the iter!
+            tree_iter = iter_next(tree_iter)
+            index += 1
+        nodes.reverse() # The stack pops from the end: keep tree order
+        return nodes
+
+    stack = children(None, "", "")
+    while stack:
+        tree_iter, path, prefix = stack.pop()
+        yield f"{prefix} {get_value(tree_iter, COL_NAME)}", tree_iter, path
+        stack.extend(children(tree_iter, path, prefix + "  └─"))
+
+@lru_cache(maxsize=None)
+def _ui_definition(name):
+    """Reads a Gtk.Builder definition from the ui/ folder, once per process."""
+    with open(resource_path(os.path.join("ui", name)), encoding="utf-8") as f:
+        return f.read()
+
+def _load_ui(name):
+    """Builds the widgets described in ui/<name> and returns the Gtk.Builder."""
+    return Gtk.Builder.new_from_string(_ui_definition(name), -1)
+
+def _nonempty(entry):
+    """True if the entry has something besides whitespace (no stripped copy made)."""
+    # A Gtk.Entry knows its length without copying the text out (Adw.EntryRow doesn't)
+    if isinstance(entry, Gtk.Entry) and entry.get_text_length() == 0:
+        return False
+    text = entry.get_text()
+    return bool(text) and not text.isspace()
+
+def _populate_groups(combo, string_list, tree_store, active_parent_iter):
+    """
+    Fills string_list with "Root" and every group of the TreeStore, selects
+    active_parent_iter in combo (an Adw.ComboRow or Gtk.DropDown) and returns
+    the parent iter for each position, None being the root.
+    """
+    names = [_("Root (/)")]
+    group_iters = [None]
+    path_to_pos = {}
+    for display_name, tree_iter, path in _walk_groups(tree_store):
+        path_to_pos[path] = len(names)
+        names.append(display_name)
+        group_iters.append(tree_iter)
+    string_list.splice(0, string_list.get_n_items(), names)
+
+    # Set the active item (defaults to "Root")
+    pos = 0
+    if active_parent_iter:
+        pos = path_to_pos.get(tree_store.get_string_from_iter(active_parent_iter), 0)
+    combo.set_selected(pos)
+    return group_iters
+
+def _selected_group_iter(combo, group_iters):
+    """Returns the parent iter picked in a groups combo (None for the root)."""
+    pos = combo.get_selected()
+    return group_iters[pos] if pos < len(group_iters) else None
+
+# One idle InputDialog per parent window, handed out again by InputDialog.reuse()
+_input_dialog_pool = weakref.WeakKeyDictionary()
+
 class InputDialog(Adw.Window):
     """
     A simple dialog with a single text entry.
     Used for "Rename" and "Login Prompt".
     """
-    __gsignals__ = {
-        'response': (GObject.SignalFlags.RUN_FIRST, None, (int,))
-    }
-
     def __init__(self, parent, title, message, default_text="", is_password=False):
         super().__init__(transient_for=parent, modal=True)
+        self._response_cb = None # Set by run_async()
         self.set_default_size(400, -1)
 
         header_bar = Adw.HeaderBar()
-        header_bar.set_title_widget(Adw.WindowTitle(title=title))
+        self.window_title = Adw.WindowTitle()
+        header_bar.set_title_widget(self.window_title)
 
         self.ok_button = Gtk.Button(label=_("OK"))
         self.ok_button.add_css_class("suggested-action")
@@ -46,51 +125,83 @@ class InputDialog(Adw.Window):
         
         self.set_content(main_box)
 
-        if message:
-            content_box.append(Gtk.Label(label=message, halign=Gtk.Align.START))
+        self.message_label = Gtk.Label(halign=Gtk.Align.START)
+        content_box.append(self.message_label)
 
         self.entry = Gtk.Entry()
-        self.entry.set_text(default_text)
-        if is_password:
-            self.entry.set_visibility(False) # Hide text for passwords
         self.entry.connect("changed", self.on_validate)
         self.entry.connect("activate", lambda e: self.ok_button.get_sensitive() and self.response(Gtk.ResponseType.OK))
         content_box.append(self.entry)
 
+        self.reset(title, message, default_text, is_password)
+
+    @classmethod
+    def reuse(cls, parent, title, message, default_text="", is_password=False):
+        """
+        Returns the pooled dialog for parent, reset for this prompt, instead of
+        building a new one every time. Falls back to a fresh dialog if the
+        pooled one is still on screen, or if there is no parent to pool it
+        for (e.g. a widget that isn't in a window yet).
+        """
+        if parent is None:
+            return cls(parent, title, message, default_text, is_password)
+        dialog = _input_dialog_pool.get(parent)
+        if dialog is None:
+            dialog = cls(parent, title, message, default_text, is_password)
+            dialog.set_hide_on_close(True) # Closing it with Esc mustn't destroy it
+            _input_dialog_pool[parent] = dialog
+        elif dialog.get_visible():
+            dialog = cls(parent, title, message, default_text, is_password)
+        else:
+            dialog.reset(title, message, default_text, is_password)
+        return dialog
+
+    def reset(self, title, message, default_text="", is_password=False):
+        """Sets up the (possibly reused) dialog for a new prompt."""
+        self.window_title.set_title(title)
+        self.message_label.set_label(message or "")
+        self.message_label.set_visible(bool(message))
+        self.entry.set_visibility(not is_password) # Hide text for passwords
+        self.entry.set_text(default_text)
         self.on_validate(self.entry)
         self.entry.grab_focus()
 
     def on_validate(self, entry):
-        text = entry.get_text().strip()
-        self.ok_button.set_sensitive(len(text) > 0)
+        self.ok_button.set_sensitive(_nonempty(entry))
 
     def get_text(self):
         return self.entry.get_text().strip()
 
     def response(self, response_id):
-        self.emit("response", response_id)
-        self.close()
+        if self._response_cb:
+            self._response_cb(self, response_id) # Hides or destroys the dialog itself
+        else:
+            self.close()
 
     def run_async(self, callback):
         """Asynchronous launch for login prompt."""
         def on_response(dialog, response):
             text = self.get_text() if response == Gtk.ResponseType.OK else None
-            self.destroy()
+            self._response_cb = None
+            parent = self.get_transient_for()
+            if parent is not None and _input_dialog_pool.get(parent) is self:
+                self.set_visible(False)
+                self.entry.set_text("") # Don't keep passwords around
+            else:
+                self.destroy()
+            # Last, so the callback may reuse this dialog for the next prompt
             callback(text)
 
-        self.connect("response", on_response)
+        self._response_cb = on_response
         self.present()
 
 class MessageDialog(Adw.Window):
     """
     A simple wrapper around Adw.MessageDialog to provide an async run method.
     """
-    __gsignals__ = {
-        'response': (GObject.SignalFlags.RUN_FIRST, None, (int,))
-    }
-
     def __init__(self, parent, heading, body=None, buttons=None):
         super().__init__(transient_for=parent, modal=True)
+        self._response_cb = None # Set by run_async()
         self.set_default_size(400, -1)
 
         self.dialog = Adw.MessageDialog(
@@ -112,33 +223,34 @@ class MessageDialog(Adw.Window):
 
         self.dialog.set_default_response(str(Gtk.ResponseType.OK))
         self.dialog.set_close_response(str(Gtk.ResponseType.CANCEL))
+        # response_id is a string for Adw.MessageDialog, convert back to int
+        self.dialog.connect("response", lambda dialog, response_id: self.response(int(response_id)))
 
         self.set_content(self.dialog)
 
     def response(self, response_id):
-        self.emit("response", response_id)
-        self.close()
+        if self._response_cb:
+            self._response_cb(self, response_id)
+        self.destroy()
 
     def run_async(self, callback):
         """Helper to run the dialog and get the result in a callback."""
-        def on_response(dialog_widget, response_id_str):
-            response_id = int(response_id_str) # Convert back to int
-            callback(self, response_id)
-            self.destroy()
-        self.dialog.connect("response", on_response)
+        self._response_cb = callback
         self.present()
 
+# Permission bits in grid order: user, group, other x read, write, execute
+_PERMISSION_BITS = (stat.S_IRUSR, stat.S_IWUSR, stat.S_IXUSR,
+                    stat.S_IRGRP, stat.S_IWGRP, stat.S_IXGRP,
+                    stat.S_IROTH, stat.S_IWOTH, stat.S_IXOTH)
+_is_octal_mode = re.compile(r'^[0-7]{1,4}$').match
+
 class PermissionsDialog(Adw.Window):
     """A dialog for viewing and editing file permissions (chmod)."""
 
-    __gsignals__ = {
-        'response': (GObject.SignalFlags.RUN_FIRST, None, (int,))
-    }
-
     def __init__(self, parent, initial_mode):
         super().__init__(transient_for=parent, modal=True)
+        self._response_cb = None # Set by run_async()
         self.set_default_size(350, -1)
-        self._is_updating = False  # Flag to prevent signal loops
 
         header_bar = Adw.HeaderBar()
         header_bar.set_title_widget(Adw.WindowTitle(title=_("Change Permissions")))
@@ -164,13 +276,9 @@ class PermissionsDialog(Adw.Window):
         grid.attach(Gtk.Label(label=_("Write"), halign=Gtk.Align.CENTER), 2, 0, 1, 1)
         grid.attach(Gtk.Label(label=_("Execute"), halign=Gtk.Align.CENTER), 3, 0, 1, 1)
 
-        self.checks = {}
-        labels = [_("Read"), _("Write"), _("Execute")]
-        values = [stat.S_IRUSR, stat.S_IWUSR, stat.S_IXUSR,
-                  stat.S_IRGRP, stat.S_IWGRP, stat.S_IXGRP,
-                  stat.S_IROTH, stat.S_IWOTH, stat.S_IXOTH]
-
-        for i, val in enumerate(values):
+        self._check_order = [] # (bit, checkbox), built once
+        self._check_handlers = [] # (widget, handler_id), blocked while we update the UI ourselves
+        for i, val in enumerate(_PERMISSION_BITS):
             row, col = divmod(i, 3) # row: 0=user, 1=group, 2=other. col: 0=read, 1=write, 2=exec
             # Add row labels (User, Group, Other)
             if col == 0:
@@ -178,8 +286,8 @@ class PermissionsDialog(Adw.Window):
                 grid.attach(Gtk.Label(label=row_labels[row], xalign=0), 0, row + 1, 1, 1)
 
             chk = Gtk.CheckButton()
-            chk.connect("toggled", self.on_check_toggled)
-            self.checks[val] = chk
+            self._check_handlers.append((chk, chk.connect("toggled", self.on_check_toggled)))
+            self._check_order.append((val, chk))
             grid.attach(chk, col + 1, row + 1, 1, 1) # Attach checkbox
 
         content_box.append(grid)
@@ -187,45 +295,49 @@ class PermissionsDialog(Adw.Window):
         octal_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6, halign=Gtk.Align.CENTER)
         octal_box.append(Gtk.Label(label=_("Octal value:")))
         self.entry_octal = Gtk.Entry(max_length=4, width_chars=5)
-        self.entry_octal.connect("changed", self.on_octal_changed)
+        self._octal_handlers = [(self.entry_octal, self.entry_octal.connect("changed", self.on_octal_changed))]
         octal_box.append(self.entry_octal)
         content_box.append(octal_box)
 
         self.set_mode(initial_mode)
 
+    @staticmethod
+    @contextmanager
+    def _blocked(handlers):
+        """Blocks the given signal handlers, so updating widgets doesn't loop back."""
+        for widget, handler_id in handlers:
+            widget.handler_block(handler_id)
+        try:
+            yield
+        finally:
+            for widget, handler_id in handlers:
+                widget.handler_unblock(handler_id)
+
     def on_check_toggled(self, checkbox):
         """Updates the octal entry when a checkbox is toggled."""
-        if self._is_updating: return
-        self._is_updating = True
         mode = 0
-        for val, chk in self.checks.items():
+        for val, chk in self._check_order:
             if chk.get_active():
                 mode |= val
-        self.entry_octal.set_text(oct(mode)[-3:])
-        self._is_updating = False
+        with self._blocked(self._octal_handlers):
+            self.entry_octal.set_text(f"{mode:03o}")
 
     def on_octal_changed(self, entry):
         """Updates checkboxes when the octal entry is changed."""
-        if self._is_updating: return
-        self._is_updating = True
-        try:
-            text = entry.get_text().strip()
-            if text:
-                mode = int(text, 8)
-                for val, chk in self.checks.items():
-                    chk.set_active(bool(mode & val))
-        except ValueError:
-            # Handle invalid input if necessary, e.g., by showing an error style
-            pass
-        self._is_updating = False
+        text = entry.get_text().strip()
+        if not _is_octal_mode(text):
+            return # Empty or not octal (yet): leave the checkboxes alone
+        mode = int(text, 8)
+        with self._blocked(self._check_handlers):
+            for val, chk in self._check_order:
+                chk.set_active(bool(mode & val))
 
     def set_mode(self, mode):
         """Sets the initial state of the dialog from a given mode."""
-        self._is_updating = True
-        for val, chk in self.checks.items():
-            chk.set_active(bool(mode & val))
-        self.entry_octal.set_text(oct(mode)[-3:])
-        self._is_updating = False
+        with self._blocked(self._check_handlers + self._octal_handlers):
+            for val, chk in self._check_order:
+                chk.set_active(bool(mode & val))
+            self.entry_octal.set_text(f"{mode & 0o777:03o}")
 
     def get_mode(self):
         """Returns the currently selected mode as an integer."""
@@ -235,7 +347,8 @@ class PermissionsDialog(Adw.Window):
             return 0 # Or handle error appropriately
 
     def response(self, response_id):
-        self.emit("response", response_id)
+        if self._response_cb:
+            self._response_cb(self, response_id)
         self.close()
 
     def run_async(self, callback):
@@ -243,23 +356,20 @@ class PermissionsDialog(Adw.Window):
         def on_response(dialog, response_id):
             mode = self.get_mode() if response_id == Gtk.ResponseType.OK else None
             callback(mode)
-        self.connect("response", on_response)
+        self._response_cb = on_response
         self.present()
 
 class HostDialog(Adw.Window):
 
-    __gsignals__ = {
-        'response': (GObject.SignalFlags.RUN_FIRST, None, (int,))
-    }
-
     def __init__(self, parent_window, tree_store, host_data_to_edit=None, parent_iter=None):
 
         super().__init__(transient_for=parent_window, modal=True)
+        self._response_cb = None # Set by run_async()
 
         self.tree_store = tree_store
         self.host_config = host_data_to_edit or {}
-        self.keyring = KeyringManager()
         self.is_edit_mode = (host_data_to_edit is not None)
+        self._has_saved_pw = False # Probed once from the keyring, then kept in sync
 
         self.set_default_size(550, -1)
 
@@ -280,105 +390,35 @@ class HostDialog(Adw.Window):
         cancel_button.connect("clicked", lambda w: self.response(Gtk.ResponseType.CANCEL))
         header_bar.pack_start(cancel_button)
 
-        page = Adw.PreferencesPage()
-
-        group_main = Adw.PreferencesGroup()
-        group_main.set_title(_("Basic Settings"))
-        page.add(group_main)
+        # The static rows come from a Gtk.Builder definition (ui/host_dialog.ui)
+        builder = _load_ui("host_dialog.ui")
+        get = builder.get_object
+        page = get("page")
 
-        self.protocol_row = Adw.ComboRow(title=_("Protocol"), model=Gtk.StringList.new(["SSH", "Telnet"]))
+        self.protocol_row = get("protocol_row")
+        self._protocol = "ssh" # Kept in sync by on_protocol_changed
         self.protocol_row.connect("notify::selected-item", self.on_protocol_changed)
-        group_main.add(self.protocol_row)
+        self.entry_name = get("entry_name")
+        self.entry_host = get("entry_host")
 
-        self.entry_name = Adw.EntryRow(title=_("Name"))
-        group_main.add(self.entry_name)
-
-        row_host = Adw.ActionRow(title=_("Address"), subtitle=_("Format: [user@]hostname"))
-        self.entry_host = Gtk.Entry()
-        self.entry_host.set_valign(Gtk.Align.CENTER)
-        row_host.add_suffix(self.entry_host)
-        row_host.set_activatable_widget(self.entry_host)
-        group_main.add(row_host)
-
-        row_group = Adw.ActionRow(title=_("Group"))
-        self.combo_group = Gtk.ComboBoxText()
-        row_group.add_suffix(self.combo_group)
-        group_main.add(row_group)
-
-        self.group_iters = {}
+        self.group_names = get("group_names")
+        self.combo_group = get("combo_group")
+        self.group_iters = [] # Parent iter for each position in group_names
         self.populate_groups_combo(parent_iter)
 
-        self.group_auth = Adw.PreferencesGroup(
-            title=_("Authentication"),
-            description=_("Saved securely in system keyring") # Moved from subtitle
-        )
-        page.add(self.group_auth)
-
-        self.password_row = Adw.PasswordEntryRow(title=_("Password"))
-        self.group_auth.add(self.password_row)
-
-        self.clear_password_button = Gtk.Button(icon_name="edit-clear-symbolic", valign=Gtk.Align.CENTER,
-                                                tooltip_text=_("Clear saved password"))
+        self.group_auth = get("group_auth")
+        self.password_row = get("password_row")
+        self.clear_password_button = get("clear_password_button")
         self.clear_password_button.connect("clicked", self.on_clear_password)
-        self.password_row.add_suffix(self.clear_password_button)
-        self.clear_password_button.set_sensitive(False) # Enabled only in edit mode if password exists
 
-        # --- Port Settings (visible for both) ---
-        self.group_port = Adw.PreferencesGroup()
-        page.add(self.group_port)
+        self.group_port = get("group_port")
+        self.entry_port = get("entry_port")
 
-        self.entry_port = Adw.SpinRow(
-            title=_("Port"),
-            subtitle=_("Leave 0 or empty for default"),
-            adjustment=Gtk.Adjustment(value=0, lower=0, upper=65535, step_increment=1)
-        )
-        self.group_port.add(self.entry_port)
-
-        # --- SSH Specific Settings ---
-        self.group_ssh_conn = Adw.PreferencesGroup(title=_("SSH Connection"))
-        page.add(self.group_ssh_conn)
-
-        self.row_key_file = Adw.EntryRow(title=_("Path to key (IdentityFile)"))
-        key_button = Gtk.Button(icon_name="document-open-symbolic")
-        key_button.set_valign(Gtk.Align.CENTER)
-        key_button.connect("clicked", self.on_choose_key_file_clicked)
-        self.row_key_file.add_suffix(key_button)
-        self.group_ssh_conn.add(self.row_key_file)
-
-        self.group_ssh_opts = Adw.PreferencesGroup(title=_("SSH Options"))
-        page.add(self.group_ssh_opts)
-
-        self.switch_compat = Adw.SwitchRow(title=_("Compatibility with old systems"),
-                                             subtitle=_("Enables old ciphers (for CentOS 5/6, etc.)"))
-        self.group_ssh_opts.add(self.switch_compat)
-
-        self.switch_forward_x = Adw.SwitchRow(title=_("X11 Forwarding"),
-                                                subtitle=_("Enables the -X flag (ForwardX11)"))
-        self.group_ssh_opts.add(self.switch_forward_x)
-
-        self.switch_agent = Adw.SwitchRow(title=_("ssh-agent Forwarding"),
-                                             subtitle=_("Enables the -A flag (ForwardAgent)"))
-        self.group_ssh_opts.add(self.switch_agent)
-
-        row_options = Adw.ActionRow(title=_("Extra SSH Options"),
-                                      subtitle=_("Example: -o ServerAliveInterval=60"))
-        self.entry_options = Gtk.Entry()
-        self.entry_options.set_valign(Gtk.Align.CENTER)
-        row_options.add_suffix(self.entry_options)
-        row_options.set_activatable_widget(self.entry_options)
-        self.group_ssh_opts.add(row_options)
-
-        # --- Telnet Specific Settings ---
-        self.group_telnet_opts = Adw.PreferencesGroup(title=_("Telnet Options"))
-        page.add(self.group_telnet_opts)
-
-        self.switch_telnet_binary = Adw.SwitchRow(title=_("Binary Mode"),
-                                                  subtitle=_("Enable binary mode transmission"))
-        self.group_telnet_opts.add(self.switch_telnet_binary)
-
-        self.switch_telnet_echo = Adw.SwitchRow(title=_("Local Echo"),
-                                                subtitle=_("Echo typed characters locally"))
-        self.group_telnet_opts.add(self.switch_telnet_echo)
+        # --- Protocol Specific Settings ---
+        # Built on first switch to their protocol (see on_protocol_changed)
+        self.page = page
+        self.group_ssh_conn = self.group_ssh_opts = None
+        self.group_telnet_opts = None
 
         # --- Field Population and Validation ---
         if self.is_edit_mode:
@@ -388,9 +428,11 @@ class HostDialog(Adw.Window):
 
 
 
-        self.entry_name.connect("notify::text", self.on_validate)
-        self.entry_host.connect("changed", self.on_validate)
-        self.entry_host.connect("changed", self.on_host_entry_changed)
+        # Typing bursts are coalesced: the checks run once things settle for 50 ms
+        self._validate_src = 0
+        # One "changed" handler per entry: it covers both validation and the address logic
+        self.entry_name.connect("changed", self._schedule_validate)
+        self.entry_host.connect("changed", self._schedule_validate)
         self.on_validate(None)
 
         main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
@@ -403,20 +445,68 @@ class HostDialog(Adw.Window):
         has_user = "@" in entry.get_text()
         self.password_row.set_sensitive(has_user)
         if not has_user:
-            if self.is_edit_mode and self.keyring.load_password(self.entry_name.get_text().strip()):
-                self.keyring.clear_password(self.entry_name.get_text().strip())
+            if self._has_saved_pw:
+                self.keyring.clear_password_async(self.entry_name.get_text().strip())
+                self._has_saved_pw = False
                 self.clear_password_button.set_sensitive(False)
             self.password_row.set_text("")
 
 
+    def _build_ssh_groups(self):
+        """Creates the SSH-only groups and fills them from the host config."""
+        builder = _load_ui("host_dialog_ssh.ui")
+        get = builder.get_object
+        self.group_ssh_conn = get("group_ssh_conn")
+        self.group_ssh_opts = get("group_ssh_opts")
+        self.page.add(self.group_ssh_conn)
+        self.page.add(self.group_ssh_opts)
+
+        self.row_key_file = get("row_key_file")
+        get("key_button").connect("clicked", self.on_choose_key_file_clicked)
+        self.switch_compat = get("switch_compat")
+        self.switch_forward_x = get("switch_forward_x")
+        self.switch_agent = get("switch_agent")
+        self.entry_options = get("entry_options")
+
+        cfg = self.host_config
+        key_path = cfg.get("key_path")
+        if key_path:
+            self.row_key_file.set_text(key_path)
+        self.switch_compat.set_active(cfg.get("compat_old_systems", False))
+        self.switch_forward_x.set_active(cfg.get("forward_x", False))
+        self.switch_agent.set_active(cfg.get("forward_agent", False))
+        self.entry_options.set_text(cfg.get("ssh_options", "") or "")
+
+    def _build_telnet_groups(self):
+        """Creates the Telnet-only group and fills it from the host config."""
+        builder = _load_ui("host_dialog_telnet.ui")
+        get = builder.get_object
+        self.group_telnet_opts = get("group_telnet_opts")
+        self.page.add(self.group_telnet_opts)
+
+        self.switch_telnet_binary = get("switch_telnet_binary")
+        self.switch_telnet_echo = get("switch_telnet_echo")
+
+        cfg = self.host_config
+        self.switch_telnet_binary.set_active(cfg.get("telnet_binary", False))
+        self.switch_telnet_echo.set_active(cfg.get("telnet_local_echo", False))
+
     def on_protocol_changed(self, combo_row, param):
         """Shows/hides options based on the selected protocol."""
-        selected_protocol = self.protocol_row.get_selected_item().get_string().lower()
-        is_ssh = (selected_protocol == "ssh")
+        # The model is a fixed ["SSH", "Telnet"] list, so the index is enough
+        self._protocol = "telnet" if self.protocol_row.get_selected() == 1 else "ssh"
+        is_ssh = (self._protocol == "ssh")
+
+        if is_ssh and self.group_ssh_conn is None:
+            self._build_ssh_groups()
+        elif not is_ssh and self.group_telnet_opts is None:
+            self._build_telnet_groups()
 
-        self.group_ssh_conn.set_visible(is_ssh)
-        self.group_ssh_opts.set_visible(is_ssh)
-        self.group_telnet_opts.set_visible(not is_ssh)
+        if self.group_ssh_conn is not None:
+            self.group_ssh_conn.set_visible(is_ssh)
+            self.group_ssh_opts.set_visible(is_ssh)
+        if self.group_telnet_opts is not None:
+            self.group_telnet_opts.set_visible(not is_ssh)
 
         # Update port subtitle and default value if it's empty
         current_port = self.entry_port.get_value()
@@ -431,67 +521,29 @@ class HostDialog(Adw.Window):
 
     def on_choose_key_file_clicked(self, button):
         """Shows the native file chooser dialog."""
-
-        file_chooser = Gtk.FileChooserDialog(
-            title=_("Select SSH Key"),
-            transient_for=self, # Attach to this dialog
-            action=Gtk.FileChooserAction.OPEN
-        )
-        file_chooser.add_button(_("Select"), Gtk.ResponseType.OK)
-        file_chooser.add_button(_("Cancel"), Gtk.ResponseType.CANCEL)
-
         filter_any = Gtk.FileFilter()
         filter_any.set_name(_("All files"))
         filter_any.add_pattern("*")
-        file_chooser.add_filter(filter_any)
+        filters = Gio.ListStore.new(Gtk.FileFilter)
+        filters.append(filter_any)
 
-        file_chooser.connect("response", self.on_key_file_chosen)
-        file_chooser.present()
+        file_dialog = Gtk.FileDialog(title=_("Select SSH Key"), accept_label=_("Select"), modal=True)
+        file_dialog.set_filters(filters)
+        file_dialog.open(self, None, self.on_key_file_chosen) # Attach to this dialog
 
-    def on_key_file_chosen(self, dialog, response):
-        """Callback for when a file is chosen in the FileChooserDialog."""
-        if response == Gtk.ResponseType.OK:
-            gfile = dialog.get_file()
-            if gfile:
-                self.row_key_file.set_text(gfile.get_path())
-        dialog.destroy()
+    def on_key_file_chosen(self, file_dialog, result):
+        """Callback for when a file is chosen in the FileDialog."""
+        try:
+            gfile = file_dialog.open_finish(result)
+        except GLib.Error:
+            return # Cancelled or dismissed
+        if gfile and gfile.get_path():
+            self.row_key_file.set_text(gfile.get_path())
 
     def populate_groups_combo(self, active_parent_iter):
-        """Recursively populates the ComboBox with groups from the TreeStore."""
-        self.combo_group.append("root", _("Root (/)"))
-        self.group_iters["root"] = None # iter for the root
-
-        def iter_groups(model, tree_iter, prefix=""):
-            node_type = model.get_value(tree_iter, COL_TYPE)
-            if node_type == "group":
-                name = model.get_value(tree_iter, COL_NAME)
-                display_name = f"{prefix} {name}"
-
-                self.combo_group.append(display_name, display_name)
-                self.group_iters[display_name] = tree_iter.copy() # Copy the iter!
-
-                # Recurse
-                child_iter = model.iter_children(tree_iter)
-                while child_iter:
-                    iter_groups(model, child_iter, prefix + "  └─")
-                    child_iter = model.iter_next(child_iter)
-
-        # Start from the root
-        root_iter = self.tree_store.get_iter_first()
-        while root_iter:
-            iter_groups(self.tree_store, root_iter)
-            root_iter = self.tree_store.iter_next(root_iter)
-
-        # Set the active item
-        if active_parent_iter:
-            # Find the group name by its iter
-            active_name = self.tree_store.get_value(active_parent_iter, COL_NAME)
-            for k, v in self.group_iters.items():
-                if v and self.tree_store.get_path(v) == self.tree_store.get_path(active_parent_iter):
-                    self.combo_group.set_active_id(k)
-                    return
-
-        self.combo_group.set_active_id("root")
+        """Fills the groups list from the TreeStore in a single splice."""
+        self.group_iters = _populate_groups(self.combo_group, self.group_names,
+                                            self.tree_store, active_parent_iter)
 
     def populate_fields(self):
         """Fills the fields with data from self.host_config (Edit mode)."""
@@ -507,41 +559,60 @@ class HostDialog(Adw.Window):
 
         port = cfg.get("port") or 0
         self.entry_port.set_value(int(port))
-
-        key_path = cfg.get("key_path")
-        if key_path:
-            self.row_key_file.set_text(key_path)
-
-        self.switch_compat.set_active(cfg.get("compat_old_systems", False))
-        self.switch_forward_x.set_active(cfg.get("forward_x", False))
-        self.switch_agent.set_active(cfg.get("forward_agent", False))
-        self.entry_options.set_text(cfg.get("ssh_options", "") or "")
-
-        self.switch_telnet_binary.set_active(cfg.get("telnet_binary", False))
-        self.switch_telnet_echo.set_active(cfg.get("telnet_local_echo", False))
+        # Protocol specific fields are filled in when their groups get built
 
         # Enable password fields based on current data
         self.on_host_entry_changed(self.entry_host)
-        # Check if a password exists to enable the clear button
-        self.clear_password_button.set_sensitive(self.keyring.load_password(cfg.get("name")) is not None)
+        # Check (once) if a password exists, without making the dialog wait for the keyring
+        self.keyring.load_password_async(cfg.get("name"), self._on_saved_password_probed)
+
+    @cached_property
+    def keyring(self):
+        return KeyringManager() # Only edit mode and passwords need it
+
+    def _on_saved_password_probed(self, password):
+        """Keyring probe result, back on the UI thread."""
+        self._has_saved_pw = password is not None
+        self.clear_password_button.set_sensitive(self._has_saved_pw)
+        self.on_host_entry_changed(self.entry_host) # Drop it if the address has no user
 
-    def on_validate(self, widget, *args): # *args because signals differ
+    def on_validate(self, widget):
         """Validates required fields."""
-        name_ok = len(self.entry_name.get_text().strip()) > 0
-        host_ok = len(self.entry_host.get_text().strip()) > 0
-        self.ok_button.set_sensitive(name_ok and host_ok)
+        self.ok_button.set_sensitive(_nonempty(self.entry_name) and _nonempty(self.entry_host))
+
+    def _schedule_validate(self, editable):
+        if not self._validate_src:
+            self._validate_src = GLib.timeout_add(50, self._do_validate)
+
+    def _do_validate(self):
+        self._validate_src = 0
+        self.on_validate(None)
+        self.on_host_entry_changed(self.entry_host)
+        return GLib.SOURCE_REMOVE
 
     def response(self, response_id):
-        self.emit("response", response_id)
+        if self._validate_src: # Don't act on a stale state: run the pending checks now
+            GLib.source_remove(self._validate_src)
+            self._do_validate()
+            if response_id == Gtk.ResponseType.OK and not self.ok_button.get_sensitive():
+                return
+        if self._response_cb:
+            self._response_cb(self, response_id)
         self.close()
 
+    def run_async(self, callback):
+        """Presents the dialog; callback(dialog, response_id) is called on OK/Cancel."""
+        self._response_cb = callback
+        self.present()
+
     def on_clear_password(self, button):
         """Handles click on the 'clear password' button."""
         host_name = self.entry_name.get_text().strip()
         if not host_name:
             return
 
-        self.keyring.clear_password(host_name)
+        self.keyring.clear_password_async(host_name)
+        self._has_saved_pw = False
         self.password_row.set_text("") # Clear the entry field
         self.clear_password_button.set_sensitive(False) # Disable button after clearing
 
@@ -554,30 +625,41 @@ class HostDialog(Adw.Window):
         # Handle password saving
         new_password = self.password_row.get_text()
         if new_password:
-            self.keyring.save_password(self.entry_name.get_text().strip(), new_password)
-
-        key_path = self.row_key_file.get_text().strip()
-        if not key_path:
-            key_path = None
+            self.keyring.save_password_async(self.entry_name.get_text().strip(), new_password)
+            self._has_saved_pw = True
 
-        protocol = self.protocol_row.get_selected_item().get_string().lower()
+        cfg = self.host_config # Fallback for groups that were never shown
 
         config = {
-            "protocol": protocol,
+            "protocol": self._protocol,
             "name": self.entry_name.get_text().strip(),
             "host": self.entry_host.get_text().strip(),
             "port": port,
-            "key_path": key_path,
-            "compat_old_systems": self.switch_compat.get_active(),
-            "forward_x": self.switch_forward_x.get_active(),
-            "forward_agent": self.switch_agent.get_active(),
-            "ssh_options": self.entry_options.get_text().strip() or None,
-            "telnet_binary": self.switch_telnet_binary.get_active(),
-            "telnet_local_echo": self.switch_telnet_echo.get_active(),
         }
+        if self.group_ssh_conn is not None:
+            config.update({
+                "key_path": self.row_key_file.get_text().strip() or None,
+                "compat_old_systems": self.switch_compat.get_active(),
+                "forward_x": self.switch_forward_x.get_active(),
+                "forward_agent": self.switch_agent.get_active(),
+                "ssh_options": self.entry_options.get_text().strip() or None,
+            })
+        else:
+            config.update({
+                "key_path": cfg.get("key_path") or None,
+                "compat_old_systems": cfg.get("compat_old_systems", False),
+                "forward_x": cfg.get("forward_x", False),
+                "forward_agent": cfg.get("forward_agent", False),
+                "ssh_options": cfg.get("ssh_options") or None,
+            })
+        if self.group_telnet_opts is not None:
+            config["telnet_binary"] = self.switch_telnet_binary.get_active()
+            config["telnet_local_echo"] = self.switch_telnet_echo.get_active()
+        else:
+            config["telnet_binary"] = cfg.get("telnet_binary", False)
+            config["telnet_local_echo"] = cfg.get("telnet_local_echo", False)
 
-        parent_id = self.combo_group.get_active_id()
-        parent_iter = self.group_iters.get(parent_id)
+        parent_iter = _selected_group_iter(self.combo_group, self.group_iters)
 
         return config, parent_iter
 
@@ -585,12 +667,9 @@ class HostDialog(Adw.Window):
 # --- CLASS: Add Group Dialog ---
 class GroupDialog(Adw.Window):
 
-    __gsignals__ = {
-        'response': (GObject.SignalFlags.RUN_FIRST, None, (int,))
-    }
-
     def __init__(self, parent_window, tree_store, parent_iter=None):
         super().__init__(transient_for=parent_window, modal=True)
+        self._response_cb = None # Set by run_async()
         self.set_default_size(400, -1)
 
         self.tree_store = tree_store
@@ -622,69 +701,108 @@ class GroupDialog(Adw.Window):
         content_box.append(self.entry_name)
 
         content_box.append(Gtk.Label(label=_("Parent Group:"), halign=Gtk.Align.START))
-        self.combo_group = Gtk.ComboBoxText()
+        self.group_names = Gtk.StringList()
+        self.combo_group = Gtk.DropDown(model=self.group_names)
         content_box.append(self.combo_group)
 
-        # Populate the ComboBox
-        self.group_iters = {}
+        # Populate the drop-down
+        self.group_iters = [] # Parent iter for each position in group_names
         self.populate_groups_combo(parent_iter)
 
         self.entry_name.grab_focus()
 
     def on_validate(self, entry):
-        text = entry.get_text().strip()
-        self.ok_button.set_sensitive(len(text) > 0)
+        self.ok_button.set_sensitive(_nonempty(entry))
 
     def response(self, response_id):
-        self.emit("response", response_id)
+        if self._response_cb:
+            self._response_cb(self, response_id)
         self.close()
 
+    def run_async(self, callback):
+        """Presents the dialog; callback(dialog, response_id) is called on OK/Cancel."""
+        self._response_cb = callback
+        self.present()
+
     def populate_groups_combo(self, active_parent_iter):
-        """Recursively populates the ComboBox with groups from the TreeStore."""
-        self.combo_group.append("root", _("Root (/)"))
-        self.group_iters["root"] = None # iter for the root
-
-        def iter_groups(model, tree_iter, prefix=""):
-            node_type = model.get_value(tree_iter, COL_TYPE)
-            if node_type == "group":
-                name = model.get_value(tree_iter, COL_NAME)
-                display_name = f"{prefix} {name}"
-
-                self.combo_group.append(display_name, display_name)
-                self.group_iters[display_name] = tree_iter.copy() # Copy the iter!
-
-                # Recurse
-                child_iter = model.iter_children(tree_iter)
-                while child_iter:
-                    iter_groups(model, child_iter, prefix + "  └─")
-                    child_iter = model.iter_next(child_iter)
-
-        # Start from the root
-        root_iter = self.tree_store.get_iter_first()
-        while root_iter:
-            iter_groups(self.tree_store, root_iter)
-            root_iter = self.tree_store.iter_next(root_iter)
-
-        # Set the active item (defaults to "Root")
-        self.combo_group.set_active_id("root")
-
-        if active_parent_iter:
-            # Find the group name by its iter
-            active_name = self.tree_store.get_value(active_parent_iter, COL_NAME)
-            for k, v in self.group_iters.items():
-                if v and self.tree_store.get_path(v) == self.tree_store.get_path(active_parent_iter):
-                    self.combo_group.set_active_id(k)
-                    return
+        """Fills the groups list from the TreeStore in a single splice."""
+        self.group_iters = _populate_groups(self.combo_group, self.group_names,
+                                            self.tree_store, active_parent_iter)
 
     def get_data(self):
         new_name = self.entry_name.get_text().strip()
-        parent_id = self.combo_group.get_active_id()
-        parent_iter = self.group_iters.get(parent_id)
+        parent_iter = _selected_group_iter(self.combo_group, self.group_iters)
         return new_name, parent_iter
 
 
 
 # --- CLASS: Settings Dialog ---
+
+# Color schemes in ComboRow order; the schemes never change at runtime.
+_SCHEME_KEYS = tuple(COLOR_SCHEMES)
+_SCHEME_NAMES = tuple(scheme.name for scheme in COLOR_SCHEMES.values())
+_SCHEME_KEY_TO_IDX = {key: i for i, key in enumerate(_SCHEME_KEYS)}
+
+# SFTP sort settings, in the order of the ComboRow items
+_SORT_COLS = ("name", "size", "date")
+_SORT_COL_IDX = {col: i for i, col in enumerate(_SORT_COLS)}
+_SORT_DIRS = ("asc", "desc")
+_SORT_DIR_IDX = {direction: i for i, direction in enumerate(_SORT_DIRS)}
+
+# SettingsDialog strings, translated once at import instead of on every open
+_T_TERMINAL = _("Terminal")
+_T_SFTP = _("SFTP")
+_T_CLIENT = _("Client Options")
+_T_COMMANDS = _("User Commands")
+_T_SORT_COL_NAMES = (_("Name"), _("Size"), _("Date")) # Same order as _SORT_COLS
+_T_SORT_DIR_NAMES = (_("Ascending"), _("Descending")) # Same order as _SORT_DIRS
+
+# SettingsDialog pages in sidebar order: (name, title, icon)
+_SETTINGS_PAGES = (
+    ("terminal", _T_TERMINAL, "utilities-terminal-symbolic"),
+    ("sftp", _T_SFTP, "folder-remote-symbolic"),
+    ("client", _T_CLIENT, "network-wired-symbolic"),
+    ("commands", _T_COMMANDS, "document-edit-symbolic"),
+)
+_SETTINGS_PAGE_INFO = {name: (title, icon) for name, title, icon in _SETTINGS_PAGES}
+
+def _selected_value(row, values):
+    """
+    The entry of values that matches the ComboRow's selection: plain tuple
+    indexing. Falls back to the first one if nothing is selected
+    (get_selected() returns Gtk.INVALID_LIST_POSITION then).
+    """
+    position = row.get_selected()
+    return values[position] if position < len(values) else values[0]
+
+def _combo_row(title, model, selected):
+    """
+    An Adw.ComboRow with its model and initial selection set under one
+    notify freeze, so the row gets a single notify::selected, not one
+    for the model's default selection and another for ours.
+    """
+    row = Adw.ComboRow(title=title)
+    with row.freeze_notify():
+        row.set_model(model)
+        row.set_selected(selected)
+    return row
+
+@lru_cache(maxsize=None)
+def _shared_string_list(items):
+    """
+    One Gtk.StringList per tuple of items, shared by every SettingsDialog.
+    ComboRows never modify their model, so sharing is safe.
+    """
+    return Gtk.StringList.new(items)
+
+class UserCommand(GObject.Object):
+    """One row of the user commands list in SettingsDialog."""
+    __gtype_name__ = "ThongSSHUserCommand"
+
+    name = GObject.Property(type=str, default="")
+    command = GObject.Property(type=str, default="")
+
+
 class SettingsDialog(Adw.Window):
     def __init__(self, parent_window, settings_manager):
         super().__init__(transient_for=parent_window, modal=True)
@@ -696,11 +814,72 @@ class SettingsDialog(Adw.Window):
 
         self.stack = Adw.ViewStack()
 
-        # --- Terminal Page ---
+        # Pages are built the first time they are shown
+        self._page_builders = {
+            "terminal": self._build_terminal_page,
+            "sftp": self._build_sftp_page,
+            "client": self._build_client_page,
+            "commands": self._build_commands_page,
+        }
+        self._built = {} # name -> page
+        # page name -> [(settings key, getter, setter)], filled in by the page builders
+        self._bindings = {}
+
+        sidebar = Gtk.ListBox()
+        sidebar.set_selection_mode(Gtk.SelectionMode.SINGLE)
+        sidebar.get_style_context().add_class("navigation-sidebar")
+
+        # Connect ListBox selection to Stack
+        sidebar.connect("row-selected", lambda listbox, row: self._show_page(row.get_name()))
+
+        # Add rows to sidebar, in stack order
+        for name, title, icon in _SETTINGS_PAGES:
+            row = Adw.ActionRow(title=title)
+            row.set_name(name)
+            sidebar.append(row)
+
+        # Even the first page is only built once the dialog is mapped, so
+        # creating a SettingsDialog costs nothing until it's presented
+        self._map_handler = self.connect("map", self._on_first_map)
+
+        split_view = Adw.NavigationSplitView(collapsed=False)
+        split_view.set_sidebar(Adw.NavigationPage.new(sidebar, _("Settings")))
+        split_view.set_content(Adw.NavigationPage.new(self.stack, ""))
+        split_view.set_vexpand(True)
+
+        header_bar.set_title_widget(Adw.WindowTitle(title=_("Settings")))
+        apply_button = Gtk.Button(label=_("Apply"), css_classes=["suggested-action"])
+        apply_button.connect("clicked", self.on_apply)
+        header_bar.pack_end(apply_button)
+
+        reset_button = Gtk.Button(label=_("Reset"))
+        reset_button.connect("clicked", self.on_reset)
+        header_bar.pack_start(reset_button)
+
+        main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        main_box.append(header_bar)
+        main_box.append(split_view)
+        self.set_content(main_box)
+
+
+    def _on_first_map(self, widget):
+        self.disconnect(self._map_handler)
+        if not self._built:
+            self._show_page("terminal")
+
+    def _show_page(self, name):
+        """Builds the page on first use, then makes it the visible one."""
+        if name not in self._built:
+            page = self._page_builders[name]()
+            title, icon = _SETTINGS_PAGE_INFO[name]
+            self.stack.add_titled_with_icon(page, name, title, icon)
+            self._built[name] = page
+        self.stack.set_visible_child_name(name)
+
+    def _build_terminal_page(self):
+        """Terminal page: appearance and behavior."""
         page_terminal = Adw.PreferencesPage()
         self.page_terminal = page_terminal # Save reference for reset
-        page_terminal.set_title(_("Terminal"))
-        page_terminal.set_icon_name("utilities-terminal-symbolic")
 
         group_appearance = Adw.PreferencesGroup()
         group_appearance.set_title(_("Appearance"))
@@ -716,17 +895,10 @@ class SettingsDialog(Adw.Window):
         font_row.set_activatable_widget(self.font_button)
         group_appearance.add(font_row)
 
-        scheme_names = [v['name'] for v in COLOR_SCHEMES.values()]
-        self.scheme_row = Adw.ComboRow(title=_("Color Scheme"), model=Gtk.StringList.new(scheme_names))
-        
-        # Find index of current scheme
+        # Find index of current scheme (unknown keys fall back to the first one)
         current_scheme_key = self.settings_manager.get("terminal.color_scheme")
-        current_scheme_name = COLOR_SCHEMES.get(current_scheme_key, {}).get('name')
-        try:
-            current_index = scheme_names.index(current_scheme_name)
-            self.scheme_row.set_selected(current_index)
-        except ValueError:
-            self.scheme_row.set_selected(0) # Default
+        self.scheme_row = _combo_row(_("Color Scheme"), _shared_string_list(_SCHEME_NAMES),
+                                     _SCHEME_KEY_TO_IDX.get(current_scheme_key, 0))
 
         group_appearance.add(self.scheme_row)
 
@@ -747,10 +919,21 @@ class SettingsDialog(Adw.Window):
         )
         self.close_on_disconnect_row.set_active(self.settings_manager.get("terminal.close_on_disconnect"))
         group_behavior.add(self.close_on_disconnect_row)
-        # --- Client Options Page ---
+
+        self._bindings["terminal"] = [
+            ("terminal.font", self.font_button.get_font, self.font_button.set_font),
+            ("terminal.color_scheme",
+             lambda: _selected_value(self.scheme_row, _SCHEME_KEYS),
+             lambda key: self.scheme_row.set_selected(_SCHEME_KEY_TO_IDX.get(key, 0))),
+            ("terminal.scrollback_lines", lambda: int(self.scrollback_row.get_value()), self.scrollback_row.set_value),
+            ("terminal.close_on_disconnect", self.close_on_disconnect_row.get_active, self.close_on_disconnect_row.set_active),
+        ]
+
+        return page_terminal
+
+    def _build_client_page(self):
+        """Client Options page: paths to the client executables."""
         page_client = Adw.PreferencesPage()
-        page_client.set_title(_("Client Options"))
-        page_client.set_icon_name("network-wired-symbolic")
 
         group_paths = Adw.PreferencesGroup(title=_("Executable Paths"))
         page_client.add(group_paths)
@@ -767,10 +950,17 @@ class SettingsDialog(Adw.Window):
         self.telnet_path_row.set_text(self.settings_manager.get("client.telnet_path"))
         group_paths.add(self.telnet_path_row)
 
-        # --- User Commands Page (Placeholder) ---
+        self._bindings["client"] = [
+            ("client.ssh_path", self.ssh_path_row.get_text, self.ssh_path_row.set_text),
+            ("client.telnet_path", self.telnet_path_row.get_text, self.telnet_path_row.set_text),
+            ("client.sshpass_path", self.sshpass_path_row.get_text, self.sshpass_path_row.set_text),
+        ]
+
+        return page_client
+
+    def _build_commands_page(self):
+        """User Commands page: commands for the host context menu."""
         page_commands = Adw.PreferencesPage()
-        page_commands.set_title(_("User Commands"))
-        page_commands.set_icon_name("document-edit-symbolic")
 
         group_commands = Adw.PreferencesGroup(title=_("Custom Commands"))
         page_commands.add(group_commands)
@@ -778,22 +968,13 @@ class SettingsDialog(Adw.Window):
         commands_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
         scrolled_view = Gtk.ScrolledWindow(vexpand=True)
         
-        self.commands_store = Gtk.ListStore(str, str)
-        # Populate from settings
-        for cmd in self.settings_manager.get("user_commands"):
-            self.commands_store.append([cmd.get("name", ""), cmd.get("command", "")])
-
-        self.commands_view = Gtk.TreeView(model=self.commands_store)
-        
-        renderer_name = Gtk.CellRendererText(editable=True)
-        renderer_name.connect("edited", self.on_command_edited, 0)
-        col_name = Gtk.TreeViewColumn(_("Name"), renderer_name, text=0)
-        self.commands_view.append_column(col_name)
+        self.commands_store = Gio.ListStore.new(UserCommand)
+        self._set_commands(self.settings_manager.get("user_commands")) # Populate from settings
 
-        renderer_cmd = Gtk.CellRendererText(editable=True)
-        renderer_cmd.connect("edited", self.on_command_edited, 1)
-        col_cmd = Gtk.TreeViewColumn(_("Command"), renderer_cmd, text=1)
-        self.commands_view.append_column(col_cmd)
+        self.commands_selection = Gtk.SingleSelection(model=self.commands_store)
+        self.commands_view = Gtk.ColumnView(model=self.commands_selection)
+        self.commands_view.append_column(self._command_column(_("Name"), "name"))
+        self.commands_view.append_column(self._command_column(_("Command"), "command"))
 
         scrolled_view.set_child(self.commands_view)
         commands_box.append(scrolled_view)
@@ -816,10 +997,39 @@ class SettingsDialog(Adw.Window):
 
         group_commands.add(commands_box)
 
-        # --- SFTP Page ---
+        self._bindings["commands"] = [("user_commands", self._get_commands, self._set_commands)]
+
+        return page_commands
+
+    @staticmethod
+    def _command_column(title, prop):
+        """A ColumnView column of EditableLabels bound both ways to a UserCommand property."""
+        factory = Gtk.SignalListItemFactory()
+
+        def on_setup(factory, list_item):
+            list_item.set_child(Gtk.EditableLabel())
+
+        def on_bind(factory, list_item):
+            label = list_item.get_child()
+            label._binding = list_item.get_item().bind_property(
+                prop, label, "text",
+                GObject.BindingFlags.BIDIRECTIONAL | GObject.BindingFlags.SYNC_CREATE)
+
+        def on_unbind(factory, list_item):
+            label = list_item.get_child()
+            label._binding.unbind()
+            label._binding = None
+
+        factory.connect("setup", on_setup)
+        factory.connect("bind", on_bind)
+        factory.connect("unbind", on_unbind)
+        column = Gtk.ColumnViewColumn(title=title, factory=factory)
+        column.set_expand(True)
+        return column
+
+    def _build_sftp_page(self):
+        """SFTP page: default path and sorting of both panels, transfers."""
         page_sftp = Adw.PreferencesPage()
-        page_sftp.set_title(_("SFTP"))
-        page_sftp.set_icon_name("folder-remote-symbolic")
 
         group_sftp_local = Adw.PreferencesGroup(title=_("Local Panel"))
         page_sftp.add(group_sftp_local)
@@ -828,148 +1038,115 @@ class SettingsDialog(Adw.Window):
         self.sftp_path_row.set_text(self.settings_manager.get("sftp.local_default_path"))
         group_sftp_local.add(self.sftp_path_row)
 
-        sort_col_model = Gtk.StringList.new([_("Name"), _("Size"), _("Date")])
-        self.sftp_sort_col_row = Adw.ComboRow(title=_("Default Sort Column"), model=sort_col_model)
-        sort_col_map = {"name": 0, "size": 1, "date": 2}
-        self.sftp_sort_col_row.set_selected(sort_col_map.get(self.settings_manager.get("sftp.local_default_sort_column"), 0))
+        sort_col_model = _shared_string_list(_T_SORT_COL_NAMES)
+        self.sftp_sort_col_row = _combo_row(_("Default Sort Column"), sort_col_model,
+                                            _SORT_COL_IDX.get(self.settings_manager.get("sftp.local_default_sort_column"), 0))
         group_sftp_local.add(self.sftp_sort_col_row)
 
-        sort_dir_model = Gtk.StringList.new([_("Ascending"), _("Descending")])
-        self.sftp_sort_dir_row = Adw.ComboRow(title=_("Default Sort Direction"), model=sort_dir_model)
-        sort_dir_map = {"asc": 0, "desc": 1}
-        self.sftp_sort_dir_row.set_selected(sort_dir_map.get(self.settings_manager.get("sftp.local_default_sort_direction"), 0))
+        sort_dir_model = _shared_string_list(_T_SORT_DIR_NAMES)
+        self.sftp_sort_dir_row = _combo_row(_("Default Sort Direction"), sort_dir_model,
+                                            _SORT_DIR_IDX.get(self.settings_manager.get("sftp.local_default_sort_direction"), 0))
         group_sftp_local.add(self.sftp_sort_dir_row)
 
         group_sftp_remote = Adw.PreferencesGroup(title=_("Remote Panel"))
         page_sftp.add(group_sftp_remote)
 
-        self.sftp_remote_sort_col_row = Adw.ComboRow(title=_("Default Sort Column"), model=sort_col_model) # Reuse model
-        remote_sort_col_map = {"name": 0, "size": 1, "date": 2}
-        self.sftp_remote_sort_col_row.set_selected(remote_sort_col_map.get(self.settings_manager.get("sftp.remote_default_sort_column"), 0))
+        self.sftp_remote_sort_col_row = _combo_row(_("Default Sort Column"), sort_col_model, # Reuse model
+                                                   _SORT_COL_IDX.get(self.settings_manager.get("sftp.remote_default_sort_column"), 0))
         group_sftp_remote.add(self.sftp_remote_sort_col_row)
 
-        self.sftp_remote_sort_dir_row = Adw.ComboRow(title=_("Default Sort Direction"), model=sort_dir_model) # Reuse model
-        remote_sort_dir_map = {"asc": 0, "desc": 1}
-        self.sftp_remote_sort_dir_row.set_selected(remote_sort_dir_map.get(self.settings_manager.get("sftp.remote_default_sort_direction"), 0))
+        self.sftp_remote_sort_dir_row = _combo_row(_("Default Sort Direction"), sort_dir_model, # Reuse model
+                                                   _SORT_DIR_IDX.get(self.settings_manager.get("sftp.remote_default_sort_direction"), 0))
         group_sftp_remote.add(self.sftp_remote_sort_dir_row)
 
+        group_sftp_transfers = Adw.PreferencesGroup(title=_("Transfers"))
+        page_sftp.add(group_sftp_transfers)
 
-        sidebar = Gtk.ListBox()
-        sidebar.set_selection_mode(Gtk.SelectionMode.SINGLE)
-        sidebar.get_style_context().add_class("navigation-sidebar")
-
-        # Connect ListBox selection to Stack
-        sidebar.connect("row-selected", lambda listbox, row: self.stack.set_visible_child_name(row.get_name()))
-
-        # Add pages to stack and rows to sidebar
-        self.stack.add_titled_with_icon(page_terminal, "terminal", _("Terminal"), "utilities-terminal-symbolic")
-        self.stack.add_titled_with_icon(page_sftp, "sftp", _("SFTP"), "folder-remote-symbolic")
-        self.stack.add_titled_with_icon(page_client, "client", _("Client Options"), "network-wired-symbolic")
-        self.stack.add_titled_with_icon(page_commands, "commands", _("User Commands"), "document-edit-symbolic")
-
-        for page in self.stack.get_pages():
-            row = Adw.ActionRow(title=page.get_title())
-            row.set_name(page.get_name())
-            sidebar.append(row)
-
-        split_view = Adw.NavigationSplitView(collapsed=False)
-        split_view.set_sidebar(Adw.NavigationPage.new(sidebar, _("Settings")))
-        split_view.set_content(Adw.NavigationPage.new(self.stack, ""))
-        split_view.set_vexpand(True)
+        self.sftp_prefetch_row = Adw.SpinRow(
+            title=_("Download Requests in Flight"),
+            subtitle=_("More helps on high-latency links (like sftp -R)"),
+            adjustment=Gtk.Adjustment(value=self.settings_manager.get("sftp.prefetch_requests"), lower=1, upper=1024, step_increment=16)
+        )
+        group_sftp_transfers.add(self.sftp_prefetch_row)
 
-        header_bar.set_title_widget(Adw.WindowTitle(title=_("Settings")))
-        apply_button = Gtk.Button(label=_("Apply"), css_classes=["suggested-action"])
-        apply_button.connect("clicked", self.on_apply)
-        header_bar.pack_end(apply_button)
+        # sshd allows 10 sessions per connection by default (MaxSessions)
+        self.sftp_channels_row = Adw.SpinRow(
+            title=_("Parallel Transfers"),
+            subtitle=_("SFTP sessions used for uploads and downloads at once"),
+            adjustment=Gtk.Adjustment(value=self.settings_manager.get("sftp.transfer_channels"), lower=1, upper=8, step_increment=1)
+        )
+        group_sftp_transfers.add(self.sftp_channels_row)
 
-        reset_button = Gtk.Button(label=_("Reset"))
-        reset_button.connect("clicked", self.on_reset)
-        header_bar.pack_start(reset_button)
+        # Each session buffers up to one window, so this is per transfer
+        self.sftp_window_row = Adw.SpinRow(
+            title=_("Window Size (MiB)"),
+            subtitle=_("Data in flight per session; raise it for fast, distant servers"),
+            adjustment=Gtk.Adjustment(value=self.settings_manager.get("sftp.window_size_mib"), lower=2, upper=256, step_increment=8)
+        )
+        group_sftp_transfers.add(self.sftp_window_row)
 
-        main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
-        main_box.append(header_bar)
-        main_box.append(split_view)
-        self.set_content(main_box)
+        self.sftp_packet_row = Adw.SpinRow(
+            title=_("Maximum Packet Size (KiB)"),
+            adjustment=Gtk.Adjustment(value=self.settings_manager.get("sftp.max_packet_kib"), lower=32, upper=256, step_increment=32)
+        )
+        group_sftp_transfers.add(self.sftp_packet_row)
+
+        def combo_binding(key, row, values, index):
+            return (key,
+                    lambda: _selected_value(row, values),
+                    lambda value: row.set_selected(index.get(value, 0)))
+
+        self._bindings["sftp"] = [
+            ("sftp.local_default_path", self.sftp_path_row.get_text, self.sftp_path_row.set_text),
+            combo_binding("sftp.local_default_sort_column", self.sftp_sort_col_row, _SORT_COLS, _SORT_COL_IDX),
+            combo_binding("sftp.local_default_sort_direction", self.sftp_sort_dir_row, _SORT_DIRS, _SORT_DIR_IDX),
+            combo_binding("sftp.remote_default_sort_column", self.sftp_remote_sort_col_row, _SORT_COLS, _SORT_COL_IDX),
+            combo_binding("sftp.remote_default_sort_direction", self.sftp_remote_sort_dir_row, _SORT_DIRS, _SORT_DIR_IDX),
+            ("sftp.prefetch_requests", lambda: int(self.sftp_prefetch_row.get_value()), self.sftp_prefetch_row.set_value),
+            ("sftp.transfer_channels", lambda: int(self.sftp_channels_row.get_value()), self.sftp_channels_row.set_value),
+            ("sftp.window_size_mib", lambda: int(self.sftp_window_row.get_value()), self.sftp_window_row.set_value),
+            ("sftp.max_packet_kib", lambda: int(self.sftp_packet_row.get_value()), self.sftp_packet_row.set_value),
+        ]
+
+        return page_sftp
 
     def on_apply(self, button):
         """Save settings and close the window."""
-        self.settings_manager.set("terminal.font", self.font_button.get_font())
-        self.settings_manager.set("terminal.scrollback_lines", int(self.scrollback_row.get_value()))
-        self.settings_manager.set("terminal.close_on_disconnect", self.close_on_disconnect_row.get_active())
-        
-        selected_idx = self.scheme_row.get_selected()
-        scheme_key = list(COLOR_SCHEMES.keys())[selected_idx]
-        self.settings_manager.set("terminal.color_scheme", scheme_key)
-
-        self.settings_manager.set("client.ssh_path", self.ssh_path_row.get_text())
-        self.settings_manager.set("client.telnet_path", self.telnet_path_row.get_text())
-        self.settings_manager.set("client.sshpass_path", self.sshpass_path_row.get_text())
-
-        # User commands
-        user_commands = []
-        for row in self.commands_store:
-            user_commands.append({"name": row[0], "command": row[1]})
-        self.settings_manager.set("user_commands", user_commands)
-
-        self.settings_manager.set("sftp.local_default_path", self.sftp_path_row.get_text())
-        sort_col_map_rev = {0: "name", 1: "size", 2: "date"}
-        self.settings_manager.set("sftp.local_default_sort_column", sort_col_map_rev.get(self.sftp_sort_col_row.get_selected(), "name"))
-        sort_dir_map_rev = {0: "asc", 1: "desc"}
-        self.settings_manager.set("sftp.local_default_sort_direction", sort_dir_map_rev.get(self.sftp_sort_dir_row.get_selected(), "asc"))
-
-        self.settings_manager.set("sftp.remote_default_sort_column", sort_col_map_rev.get(self.sftp_remote_sort_col_row.get_selected(), "name"))
-        self.settings_manager.set("sftp.remote_default_sort_direction", sort_dir_map_rev.get(self.sftp_remote_sort_dir_row.get_selected(), "asc"))
-
-
-
+        # Only built pages have bindings; the others can't have been changed
+        self.settings_manager.update({key: getter()
+                                      for bindings in self._bindings.values()
+                                      for key, getter, setter in bindings})
         self.settings_manager.save()
         self.close()
 
-    def on_command_edited(self, widget, path, text, column_index):
-        """Saves the edited text in the user commands ListStore."""
-        self.commands_store[path][column_index] = text
+    def _get_commands(self):
+        """The user commands list as it is stored in the settings."""
+        commands = []
+        for i in range(self.commands_store.get_n_items()):
+            cmd = self.commands_store.get_item(i)
+            commands.append({"name": cmd.name, "command": cmd.command})
+        return commands
+
+    def _set_commands(self, commands):
+        """Replaces the user commands list with the given one."""
+        # One splice: a single items-changed signal instead of one per command
+        new_items = [UserCommand(name=cmd["name"], command=cmd["command"]) for cmd in commands]
+        self.commands_store.splice(0, self.commands_store.get_n_items(), new_items)
 
     def on_add_command(self, button):
         """Adds a new empty row to the user commands list."""
-        self.commands_store.append([_("New Command"), ""])
+        self.commands_store.append(UserCommand(name=_("New Command"), command=""))
 
     def on_remove_command(self, button):
         """Removes the selected row from the user commands list."""
-        selection = self.commands_view.get_selection()
-        model, tree_iter = selection.get_selected()
-        if tree_iter:
-            model.remove(tree_iter)
+        position = self.commands_selection.get_selected()
+        if position != Gtk.INVALID_LIST_POSITION:
+            self.commands_store.remove(position)
 
 
     def on_reset(self, button):
         """Reset the settings on the current page to their default values."""
         current_page_name = self.stack.get_visible_child_name()
-        
-        if current_page_name == "terminal":
-            self.scrollback_row.set_value(DEFAULT_SETTINGS["terminal.scrollback_lines"])
-            self.close_on_disconnect_row.set_active(DEFAULT_SETTINGS["terminal.close_on_disconnect"])
-            self.font_button.set_font(DEFAULT_SETTINGS["terminal.font"])
-            
-            default_scheme_key = DEFAULT_SETTINGS["terminal.color_scheme"]
-            default_scheme_name = COLOR_SCHEMES.get(default_scheme_key, {}).get('name')
-            scheme_names = [v['name'] for v in COLOR_SCHEMES.values()]
-            if default_scheme_name in scheme_names:
-                self.scheme_row.set_selected(scheme_names.index(default_scheme_name))
-        elif current_page_name == "client":
-            self.ssh_path_row.set_text(DEFAULT_SETTINGS["client.ssh_path"])
-            self.telnet_path_row.set_text(DEFAULT_SETTINGS["client.telnet_path"])
-            self.sshpass_path_row.set_text(DEFAULT_SETTINGS["client.sshpass_path"])
-        elif current_page_name == "commands":
-            self.commands_store.clear()
-            default_commands = DEFAULT_SETTINGS.get("user_commands", [])
-            for cmd in default_commands:
-                self.commands_store.append([cmd.get("name", ""), cmd.get("command", "")])
-        elif current_page_name == "sftp":
-            self.sftp_path_row.set_text(DEFAULT_SETTINGS["sftp.local_default_path"])
-            sort_col_map = {"name": 0, "size": 1, "date": 2}
-            self.sftp_sort_col_row.set_selected(sort_col_map.get(DEFAULT_SETTINGS["sftp.local_default_sort_column"], 0))
-            sort_dir_map = {"asc": 0, "desc": 1}
-            self.sftp_sort_dir_row.set_selected(sort_dir_map.get(DEFAULT_SETTINGS["sftp.local_default_sort_direction"], 0))
-
-            self.sftp_remote_sort_col_row.set_selected(sort_col_map.get(DEFAULT_SETTINGS["sftp.remote_default_sort_column"], 0))
-            self.sftp_remote_sort_dir_row.set_selected(sort_dir_map.get(DEFAULT_SETTINGS["sftp.remote_default_sort_direction"], 0))
\ No newline at end of file
+        defaults = self.settings_manager.reset_defaults() # Picks up newly installed clients
+        for key, getter, setter in self._bindings.get(current_page_name, ()):
+            setter(defaults[key])
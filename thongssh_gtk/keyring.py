@@ -2,6 +2,7 @@ import gi
 gi.require_version('Secret', '1')
 from gi.repository import Secret, GLib, Gio
 import logging
+import threading
 
 from .constants import APP_ID
 
@@ -14,29 +15,28 @@ SCHEMA = Secret.Schema.new("com.example.thongssh.password",
                                "host_name": Secret.SchemaAttributeType.STRING,
                            })
 
+# host_name -> password (or None if there is none), shared by every
+# KeyringManager so a password saved in one place is seen everywhere.
+# Guarded by a lock, since load_password() is called from worker threads.
+_password_cache = {}
+_cache_lock = threading.Lock()
+_MISSING = object()
+
+def _cache_put(host_name, password):
+    with _cache_lock:
+        _password_cache[host_name] = password
+
+def _cache_drop(host_name):
+    with _cache_lock:
+        _password_cache.pop(host_name, None)
+
+
 class KeyringManager:
     """
     A manager class to handle storing, retrieving, and deleting passwords
     from the system's keyring using libsecret.
     """
 
-    def save_password(self, host_name, password):
-        """
-        Saves or updates a password in the keyring for a given host name.
-        """
-        if not host_name or not password:
-            logging.warning("Keyring: Attempted to save password with empty host_name or password.")
-            return
-
-        attributes = {
-            "app_id": APP_ID,
-            "host_name": host_name,
-        }
-        label = f"Password for {host_name} in ThongSSH"
-
-        Secret.password_store_sync(SCHEMA, attributes, Secret.COLLECTION_DEFAULT, label, password, None)
-        logging.info(f"Keyring: Password for '{host_name}' saved successfully.")
-
     def load_password(self, host_name):
         """
         Loads a password from the keyring for a given host name.
@@ -45,20 +45,96 @@ class KeyringManager:
         if not host_name:
             return None
 
+        with _cache_lock:
+            if host_name in _password_cache:
+                return _password_cache[host_name]
+
         attributes = {
             "app_id": APP_ID,
             "host_name": host_name,
         }
         item = Secret.password_lookup_sync(SCHEMA, attributes, None)
+        _cache_put(host_name, item)
         return item # This function directly returns the password string or None
 
-    def clear_password(self, host_name):
-        """
-        Deletes a password from the keyring for a given host name.
-        """
+    # --- Async variants ---
+    # load_password() blocks on a DBus round-trip to the keyring daemon, so
+    # it's for worker threads only. On the UI thread use these instead: the
+    # callback runs on the main loop once libsecret is done. Saves and clears
+    # update the cache right away, so a connect started straight after them
+    # already sees the new password.
+
+    def save_password_async(self, host_name, password, callback=None):
+        """Saves or updates the password of a host. callback() runs when it's stored."""
+        if not host_name or not password:
+            logging.warning("Keyring: Attempted to save password with empty host_name or password.")
+            return
+
+        def on_stored(source, result):
+            try:
+                Secret.password_store_finish(result)
+                logging.info(f"Keyring: Password for '{host_name}' saved successfully.")
+            except GLib.Error as e:
+                _cache_drop(host_name) # Unknown again, the next load asks the keyring
+                logging.error(f"Keyring: Failed to save password for '{host_name}': {e}")
+            except Exception: # Anything else is a bug: log it loudly, but still call back
+                _cache_drop(host_name)
+                logging.exception(f"Keyring: Unexpected error saving password for '{host_name}'")
+            if callback:
+                callback()
+
+        attributes = {"app_id": APP_ID, "host_name": host_name}
+        label = f"Password for {host_name} in ThongSSH"
+        _cache_put(host_name, password)
+        Secret.password_store(SCHEMA, attributes, Secret.COLLECTION_DEFAULT, label, password, None, on_stored)
+
+    def load_password_async(self, host_name, callback):
+        """Like load_password(), but doesn't block. callback(password or None) gets the result."""
         if not host_name:
+            callback(None)
             return
 
+        with _cache_lock:
+            cached = _password_cache.get(host_name, _MISSING)
+        if cached is not _MISSING:
+            callback(cached)
+            return
+
+        def on_lookup(source, result):
+            try:
+                password = Secret.password_lookup_finish(result)
+            except GLib.Error as e:
+                logging.error(f"Keyring: Failed to load password for '{host_name}': {e}")
+                callback(None) # Not cached, the next call tries again
+                return
+            except Exception:
+                logging.exception(f"Keyring: Unexpected error loading password for '{host_name}'")
+                callback(None)
+                return
+            _cache_put(host_name, password)
+            callback(password)
+
+        attributes = {"app_id": APP_ID, "host_name": host_name}
+        Secret.password_lookup(SCHEMA, attributes, None, on_lookup)
+
+    def clear_password_async(self, host_name, callback=None):
+        """Deletes the password of a host. callback() runs when it's done."""
+        if not host_name:
+            return
+
+        def on_cleared(source, result):
+            try:
+                Secret.password_clear_finish(result)
+                logging.info(f"Keyring: Password for '{host_name}' cleared.")
+            except GLib.Error as e:
+                _cache_drop(host_name)
+                logging.error(f"Keyring: Failed to clear password for '{host_name}': {e}")
+            except Exception:
+                _cache_drop(host_name)
+                logging.exception(f"Keyring: Unexpected error clearing password for '{host_name}'")
+            if callback:
+                callback()
+
         attributes = {"app_id": APP_ID, "host_name": host_name}
-        Secret.password_clear_sync(SCHEMA, attributes, None)
-        logging.info(f"Keyring: Password for '{host_name}' cleared.")
+        _cache_put(host_name, None) # Known to be gone
+        Secret.password_clear(SCHEMA, attributes, None, on_cleared)
@@ -1,64 +1,176 @@
+import contextlib
 import json
 import logging
-from pathlib import Path
+import os
 import shutil
+from functools import lru_cache
 from .colors import COLOR_SCHEMES
+from .config import CONFIG_DIR, ensure_config_dir
+
+# Same as for hosts.json: orjson if it's there, stdlib json otherwise.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Placeholder for future internationalization (i18n)
 _ = lambda s: s
 
-CONFIG_DIR = Path.home() / ".config" / "thongssh"
 SETTINGS_FILE = CONFIG_DIR / "settings.json"
 
-DEFAULT_SETTINGS = {
+# Each lookup walks $PATH, so remember the answers
+_which = lru_cache(maxsize=None)(shutil.which)
+
+# Defaults that need no lookups. The client paths are filled in by
+# _resolve_defaults(), so importing this module doesn't walk $PATH.
+_DEFAULTS_TEMPLATE = {
     "terminal.scrollback_lines": 8192,
     "terminal.font": "Monospace 10",
     "terminal.color_scheme": "default",
-    "client.ssh_path": shutil.which("ssh") or "/usr/bin/ssh",
-    "client.telnet_path": shutil.which("telnet") or "/usr/bin/telnet",
-    "client.sshpass_path": shutil.which("sshpass") or "/usr/bin/sshpass",
+    "client.ssh_path": None,
+    "client.telnet_path": None,
+    "client.sshpass_path": None,
     "user_commands": [],
     "sftp.local_default_path": "~/Downloads",
     "sftp.local_default_sort_column": "name", # name, size, date
     "sftp.local_default_sort_direction": "asc", # asc, desc
     "sftp.remote_default_sort_column": "name", # name, size, date
     "sftp.remote_default_sort_direction": "asc", # asc, desc
+    "sftp.prefetch_requests": 64, # Reads in flight per download, like sftp -R
+    "sftp.transfer_channels": 4, # SFTP sessions used for transfers at once
+    "sftp.window_size_mib": 32, # SSH window per SFTP session
+    "sftp.max_packet_kib": 64, # Largest SSH packet the server may send us
     "terminal.close_on_disconnect": True, # ✨ NEW: Whether to close tab on disconnect
 }
 
+# settings key -> (executable, fallback path if it's not in $PATH)
+_CLIENT_BINARIES = {
+    "client.ssh_path": ("ssh", "/usr/bin/ssh"),
+    "client.telnet_path": ("telnet", "/usr/bin/telnet"),
+    "client.sshpass_path": ("sshpass", "/usr/bin/sshpass"),
+}
+
+def _resolve_defaults():
+    """Returns a fresh dict of default settings, with the client paths looked up."""
+    defaults = _DEFAULTS_TEMPLATE.copy()
+    for key, (executable, fallback) in _CLIENT_BINARIES.items():
+        defaults[key] = _which(executable) or fallback
+    return defaults
+
+def _loads(raw):
+    """Parses settings.json bytes."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps(settings):
+    """Serializes the settings to indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(settings, option=orjson.OPT_INDENT_2)
+    return json.dumps(settings, indent=4).encode('utf-8')
+
+
+def _normalize_commands(commands):
+    """Drops malformed entries and fills in missing fields of user_commands."""
+    return [{"name": cmd.get("name", ""), "command": cmd.get("command", "")}
+            for cmd in commands if isinstance(cmd, dict)]
+
+
 class SettingsManager:
     def __init__(self):
-        self.settings = DEFAULT_SETTINGS.copy()
+        self.defaults = _resolve_defaults()
+        self.settings = self.defaults.copy()
+        self._dirty = False # Set when a value changes, cleared by save()
+        self._mtime_ns = None # mtime of settings.json as of the last load/save
         self.load()
 
     def load(self):
-        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        ensure_config_dir()
         if not SETTINGS_FILE.exists():
+            self._dirty = True # Nothing on disk yet, write the defaults
             self.save()
             return
 
         try:
-            with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
-                loaded_settings = json.load(f)
+            with open(SETTINGS_FILE, 'rb') as f:
+                loaded_settings = _loads(f.read())
+                self._mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+            if not isinstance(loaded_settings, dict): # Valid JSON, but not settings
+                raise ValueError(f"expected a JSON object, got {type(loaded_settings).__name__}")
             # Обновляем только существующие ключи, чтобы не потерять новые при обновлении
-            for key in self.settings:
-                if key in loaded_settings:
-                    self.settings[key] = loaded_settings[key]
-        except (json.JSONDecodeError, IOError) as e:
+            known = self.settings.keys() & loaded_settings.keys()
+            # Values of the wrong type (a hand-edited file) keep their current value
+            valid = {key: loaded_settings[key] for key in known
+                     if isinstance(loaded_settings[key], type(self.defaults[key]))}
+            for key in known - valid.keys():
+                logging.warning(f"Ignoring setting '{key}': expected {type(self.defaults[key]).__name__}, "
+                                f"got {type(loaded_settings[key]).__name__}")
+            self.settings.update(valid)
+            # Every command gets both fields here, once, so readers can subscript them
+            self.settings["user_commands"] = _normalize_commands(self.settings["user_commands"])
+        except (ValueError, IOError) as e: # json.JSONDecodeError is a ValueError
             logging.error(f"Failed to load settings: {e}. Using defaults.")
             # В случае ошибки, можно создать бэкап
             if SETTINGS_FILE.exists():
                 SETTINGS_FILE.rename(f"{SETTINGS_FILE}.bak")
 
     def save(self):
+        if not self._dirty:
+            return # Nothing changed since the last load/save
+        # Serialize in one go and write it to a temp file that replaces the
+        # real one, so a crash mid-write can't leave a truncated settings.json.
+        tmp_file = SETTINGS_FILE.with_suffix(SETTINGS_FILE.suffix + ".tmp")
         try:
-            with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=4)
+            data = _dumps(self.settings)
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, SETTINGS_FILE)
+            self._mtime_ns = SETTINGS_FILE.stat().st_mtime_ns
+            self._dirty = False
         except IOError as e:
+            with contextlib.suppress(OSError): # Don't leave a half-written copy behind
+                tmp_file.unlink()
             logging.error(f"Failed to save settings: {e}")
 
+    def reload_if_changed(self):
+        """
+        Re-reads settings.json if it was changed on disk (e.g. edited by hand)
+        since the last load/save. A single stat() when it wasn't.
+        Returns True if the settings were reloaded.
+        """
+        if self._dirty:
+            return False # Don't clobber unsaved changes
+        try:
+            mtime_ns = SETTINGS_FILE.stat().st_mtime_ns
+        except OSError:
+            return False
+        if mtime_ns == self._mtime_ns:
+            return False
+        self.load()
+        return True
+
+    def reset_defaults(self):
+        """
+        Looks the client paths up again (e.g. sshpass was installed after
+        the app started) and returns the fresh defaults.
+        """
+        _which.cache_clear()
+        self.defaults = _resolve_defaults()
+        return self.defaults
+
     def get(self, key):
         return self.settings.get(key)
 
     def set(self, key, value):
-        self.settings[key] = value
+        if self.settings.get(key) != value:
+            self.settings[key] = value
+            self._dirty = True
+
+    def update(self, values):
+        """Sets several keys at once."""
+        settings = self.settings
+        changed = {key: value for key, value in values.items() if settings.get(key) != value}
+        if changed:
+            settings.update(changed)
+            self._dirty = True
@@ -1,45 +1,179 @@
 import gi
 gi.require_version('Gtk', '4.0')
-from gi.repository import Gtk, Gdk, GLib, Gio
-from gi.repository import GObject # Import GObject for custom sort functions
+from gi.repository import Gtk, Gdk, GLib, Gio, Pango
+from gi.repository import GObject # For the SftpEntry list items
+import importlib.util
 import os
+import posixpath
 from pathlib import Path
+import collections
+from contextlib import contextmanager
 import datetime
+from functools import lru_cache, partial
+import itertools
 import stat
+import sys
 import logging
 import threading
 import shutil
+import socket
 import tempfile
-import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from .settings import SettingsManager
 from .keyring import KeyringManager
 from .dialogs import InputDialog, PermissionsDialog, MessageDialog # MessageDialog for delete confirmation
 
-# Attempt to import paramiko
-IS_PARAMIKO_AVAILABLE = False
-try:
-    import paramiko
-    IS_PARAMIKO_AVAILABLE = True
-except ImportError:
-    logging.warning("SFTP functionality is disabled. Please install 'paramiko' (`pip install paramiko`).")
+# paramiko (and the cryptography it pulls in) is slow to import, so it is
+# only imported by the first connection, see _get_paramiko().
+paramiko = None
+
+@lru_cache(maxsize=1)
+def _paramiko_available():
+    """Checks that paramiko is installed, without importing it."""
+    if importlib.util.find_spec("paramiko") is None:
+        logging.warning("SFTP functionality is disabled. Please install 'paramiko' (`pip install paramiko`).")
+        return False
+    return True
+
+def _get_paramiko():
+    """Imports paramiko on first use (from a worker thread, not the UI)."""
+    global paramiko
+    if paramiko is None:
+        import paramiko as module
+        paramiko = module
+    return paramiko
 
 # Placeholder for future internationalization (i18n)
 _ = lambda s: s
 
-# --- Constants for the local file list store ---
-(
-    COL_ICON,
-    COL_NAME,
-    COL_SIZE_STR,
-    COL_SIZE_BYTES, # For sorting
-    COL_PERMS_STR,
-    COL_PERMS_MODE, # For chmod (integer mode)
-    COL_MODIFIED_STR,
-    COL_MODIFIED_TS, # For sorting
-    COL_IS_DIR,
-    COL_FULL_PATH
-) = range(10)
+class SftpEntry(GObject.Object):
+    """
+    One file or directory in a panel's Gio.ListStore. Only raw values are
+    stored; the cells format them when a row becomes visible.
+    """
+    __gtype_name__ = "ThongSSHSftpEntry"
+
+    name = GObject.Property(type=str, default="")
+    size_bytes = GObject.Property(type=GObject.TYPE_INT64, default=0) # -1 for directories
+    perms_mode = GObject.Property(type=int, default=0) # For chmod (integer mode)
+    modified_ts = GObject.Property(type=GObject.TYPE_INT64, default=0)
+    is_dir = GObject.Property(type=bool, default=False)
+    full_path = GObject.Property(type=str, default="")
+
+    _FIELDS = ("name", "size_bytes", "perms_mode", "modified_ts", "is_dir", "full_path")
+
+    def copy(self, **changes):
+        """A new entry with the same values, apart from the given ones."""
+        values = {field: getattr(self, field) for field in self._FIELDS}
+        values.update(changes)
+        return SftpEntry(**values)
+
+
+# Columns of both file views: (title, sort key, fixed width). The sort key
+# is what sftp.*_default_sort_column in the settings refers to.
+_FILE_COLUMNS = (
+    (_("Name"), "name", 250),
+    (_("Size"), "size", 80),
+    (_("Date Modified"), "date", 140),
+    (_("Permissions"), None, 100), # Permissions column is not sortable
+)
+# sort key -> property the column's sorter compares
+_SORT_PROPERTIES = {"name": "name", "size": "size-bytes", "date": "modified-ts"}
+_SORT_TYPES = {"asc": Gtk.SortType.ASCENDING, "desc": Gtk.SortType.DESCENDING}
+
+# Icon names of the rows
+_ICON_DIR = "folder-symbolic"
+_ICON_FILE = "document-symbolic"
+
+# Units of the Size column, one per factor of 1024
+_SIZE_NAMES = ("B", "KiB", "MiB", "GiB", "TiB", "PiB", "EiB")
+
+
+class _FilemodeCache(dict):
+    """mode -> permission string. There are only a few distinct modes."""
+    def __missing__(self, mode):
+        text = self[mode] = sys.intern(stat.filemode(mode))
+        return text
+
+# A plain dict lookup; only unseen modes go through stat.filemode()
+_filemode = _FilemodeCache().__getitem__
+
+# Remote listings are sent to the UI in batches of this many rows
+_REMOTE_CHUNK = 200
+
+# The progress line under the transfer buttons is redrawn this often (ms),
+# however many files are in flight and however fast they go
+_PROGRESS_INTERVAL = 100
+
+# Local listings kept for going back and forth between directories
+_LOCAL_CACHE_DIRS = 16
+# Same for remote ones, which are much more expensive to fetch again
+_REMOTE_CACHE_DIRS = 64
+
+# New log lines are written to the log view at most this often (ms), in one
+# insert; at most this many lines are kept until then.
+_LOG_FLUSH_INTERVAL = 100
+_LOG_BUFFER_LINES = 500
+
+# An edited temp file is uploaded once it has been quiet for this long (ms).
+# Editors often signal a single save several times.
+_REUPLOAD_DELAY = 500
+
+# Uploads (_put_streamed()) are written and downloads copied to disk in
+# blocks of this size. SFTPFile still splits them into requests of its
+# MAX_REQUEST_SIZE, which is what servers are known to accept.
+_TRANSFER_BLOCK = 1024 * 1024
+
+# Threads removing the files of a recursive remote delete at once
+_REMOVE_THREADS = 4
+
+
+@lru_cache(maxsize=1)
+def _log_timestamp(second):
+    """The '[HH:MM:SS] ' prefix of log lines, formatted once per second."""
+    return time.strftime("[%H:%M:%S] ", time.localtime(second))
+
+
+def _iter_tree(root, relative_root="", onerror=None):
+    """
+    Walks a local directory tree with os.scandir. Yields (path, relative
+    path, size) for every file and (path, relative path, None) for every
+    directory, a directory before its contents. Like os.walk(), symlinks to
+    directories are yielded as directories but not descended into, and a
+    directory that can't be read is skipped, its OSError passed to onerror.
+    """
+    try:
+        with os.scandir(root) as it:
+            entries = list(it) # Close the fd before descending
+    except OSError as e:
+        if onerror is not None:
+            onerror(e)
+        return
+    for entry in entries:
+        relative_path = posixpath.join(relative_root, entry.name)
+        try:
+            if entry.is_dir():
+                yield entry.path, relative_path, None
+                if not entry.is_symlink():
+                    yield from _iter_tree(entry.path, relative_path, onerror)
+            elif entry.is_file():
+                yield entry.path, relative_path, entry.stat().st_size
+        except FileNotFoundError:
+            continue # Removed while we were walking
+
+
+def _open_socket(host, port, timeout=10):
+    """
+    Opens the TCP connection for paramiko ourselves, so Nagle can be turned
+    off: SFTP requests are small writes that shouldn't wait for each other.
+    Buffer sizes are left to the kernel, whose autotuning grows them further
+    than a fixed SO_SNDBUF/SO_RCVBUF (capped by net.core.*mem_max) would.
+    """
+    sock = socket.create_connection((host, port), timeout=timeout)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
 
 
 class SftpWidget(Gtk.Box):
@@ -65,17 +199,43 @@ class SftpWidget(Gtk.Box):
         self.keyring = KeyringManager()
 
         # SFTP connection state
-        self.ssh_client = None
-        self.sftp_client = None
+        self.transport = None
+        self.sftp_client = None # Listings and file operations
+        # Extra SFTP sessions for transfers, see _sftp()
+        self._sftp_idle = [] # Open sessions nobody is using
+        self._sftp_lock = threading.Lock()
+        self._transfer_channels = max(1, self.settings.get("sftp.transfer_channels"))
+        self._sftp_slots = threading.BoundedSemaphore(self._transfer_channels)
+        # Uploads, downloads and remote edits run here, as many at once as
+        # there are transfer sessions; the rest wait their turn. The files of
+        # a directory transfer are spread over a pool of the same size.
+        self.transfer_executor = ThreadPoolExecutor(max_workers=self._transfer_channels, thread_name_prefix="sftp-transfer")
+        # Rename, delete and chmod get their own small pool, so they don't
+        # queue up behind long transfers (and don't start a thread each).
+        self.metadata_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sftp-meta")
         self.current_remote_path = None
         self.is_reconnecting = False # Flag to prevent multiple reconnect attempts
         self.is_connected = False # Flag to track connection status
-        self.ui_queue = queue.Queue() # For thread-safe UI updates
+        # Every remote listing gets an id; only the newest one is shown
+        self._remote_load_ids = itertools.count(1)
+        self._remote_load_shown = 0
+        # filename -> (bytes done, total) of running transfers, see _progress()
+        self._progress_state = {}
+        self._progress_scheduled = False
+        self._progress_lock = threading.Lock() # Transfers report from several threads
+        # Log lines waiting for _flush_log(), bounded in case of a flood
+        self._log_buf = collections.deque(maxlen=_LOG_BUFFER_LINES)
+        self._log_lock = threading.Lock()
+        self._log_flush_scheduled = False
+        self._local_cache = {} # path -> (dir mtime_ns, rows), oldest first
+        # path -> rows, oldest first. Only touched in the main thread.
+        self._remote_ls_cache = collections.OrderedDict()
         self.connection_check_timer_id = None # To store the ID of the connection check timer
 
-        self.temp_dir = tempfile.mkdtemp(prefix="thongssh_sftp_")
+        self._temp_dir = None # Created by the first remote edit, see temp_dir
         self.file_monitors = {} # {local_temp_path: (monitor, remote_path)}
-        self._log_message(f"Created temporary directory for remote editing: {self.temp_dir}")
+        self._pending_uploads = {} # {local_temp_path: timer source id}
+        self._uploading = set() # Temp files whose upload is still running
 
         # --- ABSOLUTELY FIXED 50/50 LAYOUT ---
         # [ Homogeneous Box: [Frame: Local] | [Frame: Remote] ]
@@ -111,11 +271,18 @@ class SftpWidget(Gtk.Box):
         self.button_box.append(upload_button)
         self.button_box.append(download_button)
 
+        # Progress of running transfers, see _render_progress()
+        self.progress_label = Gtk.Label(ellipsize=Pango.EllipsizeMode.END, visible=False)
+        self.append(self.progress_label)
+
         # 5. The log panel at the bottom.
         log_frame = Gtk.Frame(height_request=100, vexpand=False)
         log_scrolled = Gtk.ScrolledWindow()
         log_scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
         self.log_view = Gtk.TextView(editable=False, cursor_visible=False)
+        # Right gravity: stays at the end of the log as lines are inserted
+        log_buf = self.log_view.get_buffer()
+        self._log_end_mark = log_buf.create_mark(None, log_buf.get_end_iter(), False)
         log_scrolled.set_child(self.log_view)
         log_frame.set_child(log_scrolled)
         self.append(log_frame)
@@ -123,26 +290,37 @@ class SftpWidget(Gtk.Box):
         # Start the connection process
         self.setup_actions_and_popovers()
         self._connect_sftp()
-        GLib.timeout_add(100, self._process_ui_queue)
         self.connection_check_timer_id = GLib.timeout_add_seconds(15, self._check_connection_and_reconnect) # Check connection every 15 seconds
         self.connect("unrealize", self.on_widget_destroy)
 
+    @property
+    def temp_dir(self):
+        """Directory for remote files opened for editing, created on first use."""
+        if self._temp_dir is None:
+            self._temp_dir = tempfile.mkdtemp(prefix="thongssh_sftp_")
+            self._log_message(f"Created temporary directory for remote editing: {self._temp_dir}")
+        return self._temp_dir
+
     def reconnect(self):
         """Public method to trigger a reconnection."""
         self._log_message(_("Reconnecting..."))
 
         # Clear UI and state before attempting to reconnect.
-        self.ui_queue.put(lambda: self.remote_store.clear())
-        self.ui_queue.put(lambda: self.button_box.set_sensitive(False))
-        self.ui_queue.put(lambda: self.remote_path_entry.set_text(""))
+        # ✨ UI updates from any thread go through GLib.idle_add(): the main
+        # loop runs them in order and only wakes up when there is work.
+        GLib.idle_add(self._clear_remote_store)
+        GLib.idle_add(self._remote_ls_cache.clear)
+        GLib.idle_add(lambda: self.button_box.set_sensitive(False))
+        GLib.idle_add(lambda: self.remote_path_entry.set_text(""))
 
         # Close existing clients in a separate thread to avoid blocking the UI
         self.is_connected = False
         def close_clients():
             if self.sftp_client: self.sftp_client.close()
-            if self.ssh_client: self.ssh_client.close()
+            self._close_sftp_pool()
+            if self.transport: self.transport.close()
             self.sftp_client = None
-            self.ssh_client = None
+            self.transport = None
         threading.Thread(target=close_clients, daemon=True).start()
 
         self._connect_sftp()
@@ -190,70 +368,22 @@ class SftpWidget(Gtk.Box):
         toolbar.append(self.local_path_entry)
         main_vbox.append(toolbar)
 
-        # TreeView for files
+        # ColumnView for files
         scrolled_window = Gtk.ScrolledWindow(vexpand=True)
         scrolled_window.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
         main_vbox.append(scrolled_window)
 
-        self.local_store = Gtk.ListStore(str, str, str, GObject.TYPE_INT64, str, int, str, GObject.TYPE_INT64, bool, str)
-        self.local_sortable_model = Gtk.TreeModelSort(model=self.local_store)
-        self.local_view = Gtk.TreeView(model=self.local_sortable_model)
-        self.local_view.connect("row-activated", self.on_local_row_activated)
+        self.local_store, self.local_view = self._create_file_view(
+            self.settings.get("sftp.local_default_sort_column"),
+            self.settings.get("sftp.local_default_sort_direction"))
+        self.local_view.connect("activate", self.on_local_row_activated)
 
         scrolled_window.set_child(self.local_view)
 
-        column_definitions = [
-            (_("Name"), COL_NAME),
-            (_("Size"), COL_SIZE_BYTES),
-            (_("Date Modified"), COL_MODIFIED_TS),
-            (_("Permissions"), None) # Permissions column is not directly sortable
-        ]
-
         key_controller = Gtk.EventControllerKey.new()
         key_controller.connect("key-pressed", self.on_local_view_key_pressed)
         self.local_view.add_controller(key_controller)
 
-        for i, (col_title, sort_col_id) in enumerate(column_definitions):
-            column = Gtk.TreeViewColumn(col_title)
-            column.set_resizable(True)
-            column.set_sizing(Gtk.TreeViewColumnSizing.FIXED)
-
-            # Set up sorting for the column
-            if sort_col_id is not None:
-                column.set_sort_column_id(sort_col_id)
-
-            if i == 0: # Name column with icon and text
-                column.set_fixed_width(250)
-                icon_renderer = Gtk.CellRendererPixbuf()
-                text_renderer = Gtk.CellRendererText()
-                column.pack_start(icon_renderer, False)
-                column.pack_start(text_renderer, True) # Text renderer expands
-                column.add_attribute(icon_renderer, "icon-name", COL_ICON) # Icon from COL_ICON
-                column.add_attribute(text_renderer, "text", COL_NAME) # Text from COL_NAME
-                column.set_expand(True) # Make this column fill available space
-            else: # Other columns with only text
-                text_renderer = Gtk.CellRendererText()
-                column.pack_start(text_renderer, True)
-                # Link renderer to the correct display column
-                if i == 1: # Size
-                    column.set_fixed_width(80)
-                    column.add_attribute(text_renderer, "text", COL_SIZE_STR)
-                elif i == 2: # Date
-                    column.set_fixed_width(140)
-                    column.add_attribute(text_renderer, "text", COL_MODIFIED_STR)
-                elif i == 3: # Permissions
-                    column.set_fixed_width(100)
-                    column.add_attribute(text_renderer, "text", COL_PERMS_STR)
-
-            self.local_view.append_column(column)
-
-        # ✨ Set initial sort order from settings
-        sort_col_map = {"name": COL_NAME, "size": COL_SIZE_BYTES, "date": COL_MODIFIED_TS}
-        sort_dir_map = {"asc": Gtk.SortType.ASCENDING, "desc": Gtk.SortType.DESCENDING}
-        sort_col = sort_col_map.get(self.settings.get("sftp.local_default_sort_column"), COL_NAME)
-        sort_dir = sort_dir_map.get(self.settings.get("sftp.local_default_sort_direction"), Gtk.SortType.ASCENDING)
-        self.local_sortable_model.set_sort_column_id(sort_col, sort_dir)
-
         right_click_gesture = Gtk.GestureClick.new()
         right_click_gesture.set_button(Gdk.BUTTON_SECONDARY)
         right_click_gesture.connect("pressed", self.on_view_right_click, self.local_view)
@@ -288,15 +418,16 @@ class SftpWidget(Gtk.Box):
         toolbar.append(self.remote_path_entry)
         main_vbox.append(toolbar)
 
-        # TreeView for files
+        # ColumnView for files
         scrolled_window = Gtk.ScrolledWindow(vexpand=True)
         scrolled_window.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
         main_vbox.append(scrolled_window)
 
-        self.remote_store = Gtk.ListStore(str, str, str, GObject.TYPE_INT64, str, int, str, GObject.TYPE_INT64, bool, str)
-        self.remote_sortable_model = Gtk.TreeModelSort(model=self.remote_store)
-        self.remote_view = Gtk.TreeView(model=self.remote_sortable_model)
-        self.remote_view.connect("row-activated", self.on_remote_row_activated)
+        # ✨ Initial sort order comes from settings for the remote panel too
+        self.remote_store, self.remote_view = self._create_file_view(
+            self.settings.get("sftp.remote_default_sort_column"),
+            self.settings.get("sftp.remote_default_sort_direction"))
+        self.remote_view.connect("activate", self.on_remote_row_activated)
         scrolled_window.set_child(self.remote_view)
 
         key_controller = Gtk.EventControllerKey.new()
@@ -313,79 +444,172 @@ class SftpWidget(Gtk.Box):
         scroll_controller.connect("scroll", self._on_view_scroll, scrolled_window)
         self.remote_view.add_controller(scroll_controller)
 
-        column_definitions = [
-            (_("Name"), COL_NAME), (_("Size"), COL_SIZE_BYTES),
-            (_("Date Modified"), COL_MODIFIED_TS), (_("Permissions"), None) # Permissions column is not sortable
-        ]
-        # ✨ Use a different variable name to avoid overwriting the _ function
-        for i, (col_title, sort_col_id) in enumerate(column_definitions):
-            column = Gtk.TreeViewColumn(col_title)
+        return frame
+
+    def _create_file_view(self, sort_key, sort_direction):
+        """
+        Builds the Gtk.ColumnView of one panel. Returns (store, view): the
+        Gio.ListStore of SftpEntry items to fill, and the view showing it
+        through a sort model and a single selection.
+        """
+        store = Gio.ListStore.new(SftpEntry)
+        view = Gtk.ColumnView()
+        # Directories always come first, then the order of the clicked column
+        # header (the view's sorter). Nothing is sorted in Python anymore.
+        dirs_first = Gtk.NumericSorter.new(Gtk.PropertyExpression.new(SftpEntry, None, "is-dir"))
+        dirs_first.set_sort_order(Gtk.SortType.DESCENDING) # True before False
+        sorter = Gtk.MultiSorter()
+        sorter.append(dirs_first)
+        sorter.append(view.get_sorter())
+        sort_model = Gtk.SortListModel(model=store, sorter=sorter)
+        # Sorting a big listing is spread over several frames instead of
+        # blocking one; small ones still finish in the first step.
+        sort_model.set_incremental(True)
+        view.set_model(Gtk.SingleSelection(model=sort_model, autoselect=False, can_unselect=True))
+
+        columns = {}
+        for title, key, width in _FILE_COLUMNS:
+            factory = Gtk.SignalListItemFactory()
+            if key == "name": # Name column with icon and text
+                factory.connect("setup", self._on_name_cell_setup)
+                factory.connect("bind", self._on_name_cell_bind)
+            else: # Other columns with only text
+                factory.connect("setup", self._on_text_cell_setup)
+                factory.connect("bind", self._on_text_cell_bind, self._CELL_TEXT[key])
+            column = Gtk.ColumnViewColumn(title=title, factory=factory)
             column.set_resizable(True)
-            column.set_sizing(Gtk.TreeViewColumnSizing.FIXED)
-            if sort_col_id is not None:
-                column.set_sort_column_id(sort_col_id)
-
-            if i == 0: # Name column
-                column.set_fixed_width(250)
-                column.pack_start(Gtk.CellRendererPixbuf(), False)
-                column.pack_start(Gtk.CellRendererText(), True)
-                column.add_attribute(column.get_cells()[0], "icon-name", COL_ICON)
-                column.add_attribute(column.get_cells()[1], "text", COL_NAME)
+            column.set_fixed_width(width)
+            if key == "name":
                 column.set_expand(True) # Make this column fill available space
-            else: # Other columns
-                renderer = Gtk.CellRendererText()
-                column.pack_start(renderer, True)
-                if i == 1: # Size
-                    column.set_fixed_width(80)
-                    column.add_attribute(renderer, "text", COL_SIZE_STR)
-                elif i == 2: # Date
-                    column.set_fixed_width(140)
-                    column.add_attribute(renderer, "text", COL_MODIFIED_STR)
-                elif i == 3: # Permissions
-                    column.set_fixed_width(100)
-                    column.add_attribute(renderer, "text", COL_PERMS_STR)
-            self.remote_view.append_column(column)
-
-        # ✨ Set initial sort order from settings for remote panel
-        sort_col_map = {"name": COL_NAME, "size": COL_SIZE_BYTES, "date": COL_MODIFIED_TS}
-        sort_dir_map = {"asc": Gtk.SortType.ASCENDING, "desc": Gtk.SortType.DESCENDING}
-        sort_col = sort_col_map.get(self.settings.get("sftp.remote_default_sort_column"), COL_NAME)
-        sort_dir = sort_dir_map.get(self.settings.get("sftp.remote_default_sort_direction"), Gtk.SortType.ASCENDING)
-        self.remote_sortable_model.set_sort_column_id(sort_col, sort_dir)
 
-        return frame
+            # Set up sorting for the column
+            if key is not None:
+                expression = Gtk.PropertyExpression.new(SftpEntry, None, _SORT_PROPERTIES[key])
+                if key == "name":
+                    name_sorter = Gtk.StringSorter.new(expression)
+                    name_sorter.set_ignore_case(True)
+                    column.set_sorter(name_sorter)
+                else:
+                    column.set_sorter(Gtk.NumericSorter.new(expression))
+                columns[key] = column
+            view.append_column(column)
 
-    def _load_local_directory(self, path):
-        """Populates the local file view with the contents of the given path."""
-        self.local_store.clear()
+        # ✨ Set initial sort order from settings
+        view.sort_by_column(columns.get(sort_key, columns["name"]),
+                            _SORT_TYPES.get(sort_direction, Gtk.SortType.ASCENDING))
+        return store, view
+
+    @staticmethod
+    def _on_name_cell_setup(factory, list_item):
+        box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+        box.append(Gtk.Image())
+        box.append(Gtk.Label(xalign=0, ellipsize=Pango.EllipsizeMode.END))
+        box._list_item = list_item # Lets a right click find its row, see _position_at()
+        list_item.set_child(box)
+
+    @staticmethod
+    def _on_name_cell_bind(factory, list_item):
+        entry = list_item.get_item()
+        icon = list_item.get_child().get_first_child()
+        icon.set_from_icon_name(_ICON_DIR if entry.is_dir else _ICON_FILE)
+        icon.get_next_sibling().set_label(entry.name)
+
+    @staticmethod
+    def _on_text_cell_setup(factory, list_item):
+        label = Gtk.Label(xalign=0, ellipsize=Pango.EllipsizeMode.END)
+        label._list_item = list_item
+        list_item.set_child(label)
+
+    @staticmethod
+    def _on_text_cell_bind(factory, list_item, to_text):
+        list_item.get_child().set_label(to_text(list_item.get_item()))
+
+    @staticmethod
+    def _position_at(view, x, y):
+        """Position of the row under (x, y) in the view's model, or None."""
+        widget = view.pick(x, y, Gtk.PickFlags.DEFAULT)
+        while widget is not None and widget is not view:
+            list_item = getattr(widget, "_list_item", None)
+            if list_item is not None:
+                position = list_item.get_position()
+                return None if position == Gtk.INVALID_LIST_POSITION else position
+            widget = widget.get_parent()
+        return None
+
+    @staticmethod
+    def _selected_entry(view):
+        """The SftpEntry selected in the view, or None."""
+        return view.get_model().get_selected_item()
+
+    def _load_local_directory(self, path, use_cache=False):
+        """
+        Populates the local file view with the contents of the given path.
+        Navigation passes use_cache=True: a directory whose mtime hasn't
+        changed since it was last listed then shows its cached rows without
+        being scanned again. Reloads after file operations and Refresh
+        always scan, since a changed file doesn't touch its directory's mtime.
+        """
         self.current_local_path = path
         self.local_path_entry.set_text(path)
 
         try:
-            for filename in os.listdir(path):
-                full_path = Path(path) / filename
-                try:
-                    st = full_path.stat()
-                    if stat.S_ISDIR(st.st_mode):
-                        self.local_store.append([ # Icon, Name, Size Str, Size Bytes, Perms Str, Perms Mode, Modified Str, Modified TS, Is Dir, Full Path (10 elements)
-                            "folder-symbolic", filename, "<DIR>", -1, stat.filemode(st.st_mode), st.st_mode, self._format_date(st.st_mtime), int(st.st_mtime), True, str(full_path)
-                        ])
-                    else:
-                        self.local_store.append([ # Icon, Name, Size Str, Size Bytes, Perms Str, Perms Mode, Modified Str, Modified TS, Is Dir, Full Path (10 elements)
-                            "document-symbolic", filename, self._format_size(st.st_size), st.st_size, stat.filemode(st.st_mode), st.st_mode, self._format_date(st.st_mtime), int(st.st_mtime), False, str(full_path)
-                        ])
-                except (OSError, PermissionError):
-                    continue
+            dir_mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            dir_mtime = None
+        cached = self._local_cache.pop(path, None)
+        if use_cache and cached is not None and dir_mtime is not None and cached[0] == dir_mtime:
+            entries = cached[1]
+        else:
+            entries = self._scan_local_directory(path)
+        if dir_mtime is not None:
+            self._local_cache[path] = (dir_mtime, entries) # Re-inserted as the newest
+            if len(self._local_cache) > _LOCAL_CACHE_DIRS:
+                del self._local_cache[next(iter(self._local_cache))] # Drop the oldest
+
+        # One splice replaces the old rows, so the view updates once
+        self.local_store.splice(0, self.local_store.get_n_items(), entries)
+
+    def _scan_local_directory(self, path):
+        """Returns SftpEntry rows for the contents of a local directory."""
+        entries = []
+        # Looked up once, not per row: this loop runs for every file
+        append, S_ISDIR = entries.append, stat.S_ISDIR
+        try:
+            # One scandir() pass gives names and full paths. stat() still
+            # follows symlinks, so a link to a directory can be opened.
+            # No sorting here, the view's sort model does that.
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue # Broken link or no permission
+                    is_dir = S_ISDIR(st.st_mode)
+                    append(SftpEntry(
+                        name=entry.name, size_bytes=-1 if is_dir else st.st_size,
+                        perms_mode=st.st_mode, modified_ts=int(st.st_mtime),
+                        is_dir=is_dir, full_path=entry.path))
 
         except (PermissionError, FileNotFoundError) as e:
             logging.error(f"Error loading local directory '{path}': {e}")
             # Optionally, show an error in the UI
+        return entries
 
-    def _load_remote_directory_threaded(self, path):
-        """Wrapper to run _load_remote_directory in a background thread."""
+    def _load_remote_directory_threaded(self, path, use_cache=False):
+        """
+        Wrapper to run _load_remote_directory in a background thread.
+        Navigation passes use_cache=True and gets a directory listed before
+        shown right away, unless one of our own operations changed it since
+        (see _forget_remote()). Refresh always asks the server.
+        """
         if not self.sftp_client:
             self._log_message(_("Error: SFTP client not connected."))
             return
+        rows = self._remote_ls_cache.get(path) if use_cache else None
+        if rows is not None:
+            self._remote_ls_cache.move_to_end(path)
+            self._add_remote_rows(next(self._remote_load_ids), path, rows, True)
+            return
         thread = threading.Thread(target=self._load_remote_directory, args=(path,))
         thread.daemon = True
         thread.start()
@@ -393,51 +617,115 @@ class SftpWidget(Gtk.Box):
     def _load_remote_directory(self, path):
         """Populates the remote file view (runs in a thread)."""
         self._log_message(_("Reading remote directory: {path}...").format(path=path))
+        load_id = next(self._remote_load_ids)
         try:
-            items = self.sftp_client.listdir_attr(path)
-            
-            # Prepare data for UI update
-            rows_to_add = []
-            
-            dirs, files = [], []
-            for attr in items:
-                if stat.S_ISDIR(attr.st_mode):
-                    dirs.append(attr)
-                else:
-                    files.append(attr)
-            
-            dirs.sort(key=lambda x: x.filename.lower())
-            files.sort(key=lambda x: x.filename.lower())
-
-            for attr in dirs:
-                rows_to_add.append([ # Icon, Name, Size Str, Size Bytes, Perms Str, Perms Mode, Modified Str, Modified TS, Is Dir, Full Path (10 elements)
-                    "folder-symbolic", attr.filename, "<DIR>", -1, stat.filemode(attr.st_mode), attr.st_mode, self._format_date(attr.st_mtime), int(attr.st_mtime),
-                    True, os.path.join(path, attr.filename)
-                ])
-            for attr in files:
-                rows_to_add.append([ # Icon, Name, Size Str, Size Bytes, Perms Str, Perms Mode, Modified Str, Modified TS, Is Dir, Full Path (10 elements)
-                    "document-symbolic", attr.filename, self._format_size(attr.st_size), attr.st_size, stat.filemode(attr.st_mode), attr.st_mode, self._format_date(attr.st_mtime), int(attr.st_mtime),
-                    False, os.path.join(path, attr.filename)
-                ])
-
-            # Send data to the main thread for UI update
-            def update_ui():
-                self.remote_store.clear()
-                for row in rows_to_add:
-                    self.remote_store.append(row)
-                self.current_remote_path = path
-                self.remote_path_entry.set_text(path)
-                self.remote_sortable_model.set_sort_column_id(COL_NAME, Gtk.SortType.ASCENDING)
-
-            self.ui_queue.put(update_ui)
+            # listdir_iter() yields entries while later ones are still on the
+            # way, so rows are sent to the UI in batches as they come in.
+            # Sorting is up to the view.
+            batch = []
+            first = True
+            rows = [] # The whole listing, for the cache
+            S_ISDIR = stat.S_ISDIR
+            for attr in self.sftp_client.listdir_iter(path):
+                is_dir = S_ISDIR(attr.st_mode)
+                batch.append(SftpEntry(
+                    name=attr.filename, size_bytes=-1 if is_dir else attr.st_size,
+                    perms_mode=attr.st_mode, modified_ts=int(attr.st_mtime),
+                    is_dir=is_dir, full_path=posixpath.join(path, attr.filename)))
+                if len(batch) >= _REMOTE_CHUNK:
+                    GLib.idle_add(self._add_remote_rows, load_id, path, batch, first)
+                    rows.extend(batch)
+                    batch = []
+                    first = False
+            # Always sent, even if empty: for an empty directory it clears the view
+            GLib.idle_add(self._add_remote_rows, load_id, path, batch, first)
+            rows.extend(batch)
+            GLib.idle_add(self._cache_remote_listing, path, rows)
             self._log_message(_("Successfully listed remote directory: {path}").format(path=path))
 
         except Exception as e:
             self._log_message(_("Error reading remote directory '{path}': {e}").format(path=path, e=e), is_error=True)
 
+    def _add_remote_rows(self, load_id, path, rows, first):
+        """
+        Adds one batch of a remote listing to the store (main thread). Each
+        batch is its own idle callback, so frames get drawn in between.
+        The first batch replaces the old rows; batches of a listing that
+        has been replaced by a newer one are dropped.
+        """
+        store = self.remote_store
+        if first:
+            if load_id < self._remote_load_shown:
+                return False # An older listing that finished late
+            self._remote_load_shown = load_id
+            store.splice(0, store.get_n_items(), rows)
+            self.current_remote_path = path
+            self.remote_path_entry.set_text(path)
+        elif load_id == self._remote_load_shown:
+            store.splice(store.get_n_items(), 0, rows)
+        return False
+
+    def _cache_remote_listing(self, path, rows):
+        """Remembers a complete remote listing (main thread)."""
+        cache = self._remote_ls_cache
+        cache[path] = rows
+        cache.move_to_end(path)
+        if len(cache) > _REMOTE_CACHE_DIRS:
+            cache.popitem(last=False) # Drop the oldest
+        return False
+
+    def _forget_remote(self, *paths):
+        """
+        Drops cached listings that an operation on the given remote paths
+        made stale: their parent directories and, for directories, they
+        themselves and everything below them. Main thread; workers go
+        through GLib.idle_add().
+        """
+        cache = self._remote_ls_cache
+        for path in paths:
+            cache.pop(posixpath.dirname(path), None)
+            prefix = path.rstrip('/') + '/'
+            for cached in [p for p in cache if p == path or p.startswith(prefix)]:
+                del cache[cached]
+        return False
+
+    def _refresh_local_dir(self, path):
+        """Lists path again if the local view is showing it. Main thread."""
+        if path == self.current_local_path:
+            self._load_local_directory(path)
+        return False
+
+    def _forget_local(self, path):
+        """
+        Drops the cached listing of path's parent. Needed after in-place row
+        patches, since e.g. a chmod doesn't change the directory's mtime.
+        """
+        self._local_cache.pop(os.path.dirname(path), None)
+        return False
+
+    @staticmethod
+    def _patch_row(store, path, **changes):
+        """
+        Shows a one-item change without listing the directory again: the row
+        of path is replaced by a copy with the given changes, or removed if
+        there are none. Rows are swapped rather than edited, since the cells
+        only read an entry when they are bound. Main thread; workers go
+        through GLib.idle_add().
+        """
+        for position, entry in enumerate(store):
+            if entry.full_path == path:
+                store.splice(position, 1, [entry.copy(**changes)] if changes else [])
+                break
+        return False # Not found: the view has moved on to another directory
+
+    def _clear_remote_store(self):
+        """Empties the remote view and drops batches of listings still in flight."""
+        self._remote_load_shown = next(self._remote_load_ids)
+        self.remote_store.remove_all()
+
     def _connect_sftp(self):
         """Connects to the SFTP server in a background thread."""
-        if not IS_PARAMIKO_AVAILABLE:
+        if not _paramiko_available():
             self._log_message(_("SFTP is disabled. Please install 'paramiko'."), is_error=True)
             return
 
@@ -447,7 +735,7 @@ class SftpWidget(Gtk.Box):
             return
 
         if '@' not in host_str:
-            dialog = InputDialog(
+            dialog = InputDialog.reuse(
                 self.get_root(),
                 title=_("Username Required"),
                 message=_("Enter username for {host_str}").format(host_str=host_str)
@@ -469,6 +757,7 @@ class SftpWidget(Gtk.Box):
 
     def _sftp_connect_worker(self, username_from_prompt, key_passphrase=None, auth_password=None):
         """The actual connection logic that runs in a thread."""
+        _get_paramiko()
         cfg = self.host_config
         host_str = cfg.get("host", "")
         
@@ -483,39 +772,40 @@ class SftpWidget(Gtk.Box):
 
         port = int(cfg.get("port") or 22)
         key_filename = cfg.get("key_path")
-        
+
+        # One TCP connection and key exchange serve all authentication
+        # attempts below; only the credentials change between them.
+        try:
+            transport = self._open_transport(host, port)
+        except Exception as e:
+            self._log_message(_("SFTP connection failed: {e}").format(e=e), is_error=True)
+            self.is_reconnecting = False
+            return
+        self.transport = transport
+        authenticated = False
+
+        # 1. A password the user just entered.
         if auth_password:
             try:
                 self._log_message(_("Attempting connection with provided password..."))
-                self.ssh_client = paramiko.SSHClient()
-                self.ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                self.ssh_client.connect(host, port=port, username=user, password=auth_password, timeout=10, allow_agent=False, look_for_keys=False)
-                self.sftp_client = self.ssh_client.open_sftp()
+                transport.auth_password(user, auth_password)
+                authenticated = True
                 self._log_message(_("SFTP connection established successfully with provided password."))
-                initial_path = self.sftp_client.normalize('.')
-                self._load_remote_directory(initial_path)
-                self.ui_queue.put(lambda: self.button_box.set_sensitive(True))
-                self.is_connected = True
-                self.is_reconnecting = False
-                return
             except Exception as e:
                 self._log_message(_("Provided password authentication failed: {e}").format(e=e), is_error=True)
 
         # 2. Try with key first, if it exists and no auth_password was successful.
-        if key_filename and not self.sftp_client: # Only try key if not already connected
+        if key_filename and not authenticated:
             try:
                 self._log_message(_("Attempting connection with SSH key..."))
-                self.ssh_client = paramiko.SSHClient()
-                self.ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                self.ssh_client.connect(host, port=port, username=user, password=key_passphrase, key_filename=key_filename, timeout=10)
-                self.sftp_client = self.ssh_client.open_sftp()
+                self._auth_publickey(transport, user, key_filename, key_passphrase)
+                authenticated = True
                 self._log_message(_("SFTP connection established successfully with key."))
-                self.is_connected = True
-                self.is_reconnecting = False
             except paramiko.PasswordRequiredException:
+                transport.close() # The next attempt comes after the prompt
                 self._log_message(_("SSH key is encrypted. Please enter the passphrase."))
                 def prompt_for_key_password():
-                    dialog = InputDialog(
+                    dialog = InputDialog.reuse(
                         self.get_root(),
                         title=_("SSH Key Passphrase"),
                         message=_("Enter passphrase for key '{key}'").format(key=os.path.basename(key_filename)),
@@ -526,31 +816,28 @@ class SftpWidget(Gtk.Box):
                 return
             except paramiko.AuthenticationException:
                 self._log_message(_("Key authentication failed. Falling back to password..."))
-                pass
             except Exception as e:
+                transport.close()
                 self._log_message(_("SFTP connection failed with key: {e}").format(e=e), is_error=True)
                 return # Stop on other errors
 
         # 3. If key auth was skipped or failed, and no auth_password was successful, try saved password from keyring.
-        if not self.sftp_client:
+        if not authenticated:
             password_from_keyring = self.keyring.load_password(cfg.get("name"))
             if password_from_keyring:
                 self._log_message(_("Attempting connection with saved password..."))
                 try:
-                    self.ssh_client = paramiko.SSHClient()
-                    self.ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                    self.ssh_client.connect(host, port=port, username=user, password=password_from_keyring, key_filename=None, timeout=10, allow_agent=False, look_for_keys=False)
-                    self.sftp_client = self.ssh_client.open_sftp()
+                    transport.auth_password(user, password_from_keyring)
+                    authenticated = True
                     self._log_message(_("SFTP connection established successfully with password."))
-                    self.is_connected = True
-                    self.is_reconnecting = False
                 except Exception as e:
                     self._log_message(_("Saved password authentication failed: {e}").format(e=e), is_error=True)
             else:
                 # 4. If no saved password, prompt for one.
+                transport.close() # The next attempt comes after the prompt
                 self._log_message(_("No key or saved password. Please enter password."))
                 def prompt_for_password():
-                    dialog = InputDialog(
+                    dialog = InputDialog.reuse(
                         self.get_root(),
                         title=_("Password Required"),
                         message=_("Enter password for {user}@{host}").format(user=user, host=host),
@@ -562,166 +849,362 @@ class SftpWidget(Gtk.Box):
                         else:
                             self._log_message(_("Connection canceled."), is_error=True)
                     dialog.run_async(on_password_entered)
-                self.ui_queue.put(prompt_for_password)
+                GLib.idle_add(prompt_for_password)
                 return # Stop this worker
 
-        # 3. If connection was successful (either by key or password)
-        if self.sftp_client:
-            initial_path = self.sftp_client.normalize('.')
-            self._load_remote_directory(initial_path)
-            self.ui_queue.put(lambda: self.button_box.set_sensitive(True))
-            self.is_connected = True
-            self.is_reconnecting = False
+        # 5. If authentication was successful (either by key or password)
+        if authenticated:
+            try:
+                self.sftp_client = self._open_sftp()
+                initial_path = self.sftp_client.normalize('.')
+                self._load_remote_directory(initial_path)
+                GLib.idle_add(lambda: self.button_box.set_sensitive(True))
+                self.is_connected = True
+                self.is_reconnecting = False
+                return
+            except Exception as e:
+                self._log_message(_("Failed to open SFTP session: {e}").format(e=e), is_error=True)
         else:
             # If we reach here, it means all attempts failed.
             self._log_message(_("Authentication failed. Please check credentials and connection."), is_error=True)
-            self.is_reconnecting = False # Reset the flag on total failure
+        transport.close()
+        self.is_reconnecting = False # Reset the flag on total failure
 
-    def _make_progress_callback(self, filename, total_size):
-        """Creates a callback function for paramiko to track file transfer progress."""
-        last_percent = -1
+    @staticmethod
+    def _open_transport(host, port):
+        """
+        Connects and runs the SSH handshake, without authenticating. Like the
+        AutoAddPolicy SSHClient used before, any host key is accepted.
+        """
+        transport = paramiko.Transport(_open_socket(host, port))
+        transport.start_client(timeout=10)
+        return transport
 
-        def progress(bytes_transferred, _total_bytes):
-            nonlocal last_percent
-            if total_size == 0:
+    @staticmethod
+    def _auth_publickey(transport, user, key_filename, passphrase):
+        """
+        Authenticates with the configured key file, then with the keys of a
+        running ssh-agent, in the order SSHClient.connect() tries them.
+        Raises PasswordRequiredException if the key file needs a passphrase.
+        """
+        try:
+            transport.auth_publickey(user, SftpWidget._load_private_key(key_filename, passphrase))
+            return
+        except paramiko.PasswordRequiredException:
+            raise
+        except (paramiko.AuthenticationException, paramiko.SSHException, OSError) as e:
+            error = e # Wrong or unreadable key: the agent may still have the right one
+        for key in paramiko.Agent().get_keys():
+            try:
+                transport.auth_publickey(user, key)
                 return
+            except paramiko.AuthenticationException as e:
+                error = e
+        raise paramiko.AuthenticationException(str(error))
+
+    @staticmethod
+    def _load_private_key(key_filename, passphrase):
+        """Loads a private key file of any type paramiko supports."""
+        if hasattr(paramiko.PKey, 'from_path'):
+            return paramiko.PKey.from_path(key_filename, passphrase)
+        # paramiko < 3.2 (e.g. distro packages): try each key type, like SSHClient does
+        error = None
+        for key_class in (paramiko.RSAKey, paramiko.DSSKey, paramiko.ECDSAKey, paramiko.Ed25519Key):
+            try:
+                return key_class.from_private_key_file(key_filename, passphrase)
+            except paramiko.PasswordRequiredException:
+                raise
+            except paramiko.SSHException as e:
+                error = e # Not this type, try the next one
+        raise error
 
-            percent = int((bytes_transferred / total_size) * 100)
+    def _open_sftp(self):
+        """
+        Opens an SFTP session on the authenticated transport. Its channel gets
+        the window and packet size from the settings: paramiko's defaults
+        (2 MiB, 32 KiB) cap the throughput of high-latency links well below
+        what they can carry, since at most one window can be in flight.
+        """
+        return paramiko.SFTPClient.from_transport(
+            self.transport,
+            window_size=self.settings.get("sftp.window_size_mib") * 1024 * 1024,
+            max_packet_size=self.settings.get("sftp.max_packet_kib") * 1024)
 
-            # Log progress in increments of 10% to avoid spamming the log
-            if percent >= last_percent + 10:
-                last_percent = percent
-                self._log_message(_("Transferring {filename}: {percent}%").format(filename=filename, percent=percent))
+    @contextmanager
+    def _sftp(self):
+        """
+        Checks out an SFTP session for one transfer. Each session is its own
+        channel (and sftp-server process), so transfers run side by side
+        instead of queueing behind each other and the listings on
+        sftp_client. Sessions are opened on first need, at most
+        sftp.transfer_channels of them, and kept for the next transfer.
+        """
+        with self._sftp_slots:
+            with self._sftp_lock:
+                client = self._sftp_idle.pop() if self._sftp_idle else None
+            if client is None:
+                client = self._open_sftp()
+            try:
+                yield client
+            finally:
+                channel = client.get_channel()
+                if channel.closed or channel.get_transport() is not self.transport:
+                    client.close() # Broken, or left over from before a reconnect
+                else:
+                    with self._sftp_lock:
+                        self._sftp_idle.append(client)
+
+    def _close_sftp_pool(self):
+        """Closes the idle transfer sessions; busy ones are closed when returned."""
+        with self._sftp_lock:
+            idle, self._sftp_idle = self._sftp_idle, []
+        for client in idle:
+            client.close()
+
+    def _progress(self, path, total_size, bytes_transferred, _total_bytes):
+        """
+        paramiko progress callback, bound to a file's full path with
+        functools.partial, so same-named files of one tree don't collide.
+        Only records the numbers; the UI is left to _render_progress().
+        """
+        with self._progress_lock:
+            self._progress_state[path] = (bytes_transferred, total_size)
+            if self._progress_scheduled:
+                return
+            self._progress_scheduled = True
+        GLib.timeout_add(_PROGRESS_INTERVAL, self._render_progress)
 
-        return progress
+    def _end_progress(self, path):
+        """Drops a file from the progress line once its transfer is over, however it ended."""
+        with self._progress_lock:
+            self._progress_state.pop(path, None)
+
+    def _render_progress(self):
+        """
+        Shows the latest percentage of every running transfer (main thread).
+        Finished files are shown once more and then dropped; the timer stops
+        when there is nothing left to show.
+        """
+        with self._progress_lock:
+            state = self._progress_state
+            self._progress_state = {path: (done, total) for path, (done, total) in state.items() if done < total}
+            if not state:
+                self._progress_scheduled = False
+        if not state:
+            self.progress_label.set_visible(False)
+            return False
+        progress = ", ".join(f"{os.path.basename(path)} {done * 100 // total if total else 100}%"
+                             for path, (done, total) in state.items())
+        self.progress_label.set_label(_("Transferring {progress}").format(progress=progress))
+        self.progress_label.set_visible(True)
+        return True
 
     def on_upload_clicked(self, button):
         """Handles the click on the Upload (>) button."""
-        selection = self.local_view.get_selection()
-        model, paths = selection.get_selected_rows()
-        if not paths:
+        entry = self._selected_entry(self.local_view)
+        if entry is None:
             self._log_message(_("No local files selected for upload."), is_error=True)
             return
 
-        for path in paths:
-            tree_iter = model.get_iter(path)
-            local_path = model.get_value(tree_iter, COL_FULL_PATH)
-            is_dir = model.get_value(tree_iter, COL_IS_DIR)
-            remote_dest_dir = self.current_remote_path
+        local_path = entry.full_path
+        is_dir = entry.is_dir
+        remote_dest_dir = self.current_remote_path
 
-            self._log_message(_("Queueing upload for: {path}").format(path=local_path))
-            thread = threading.Thread(target=self._upload_worker, args=(local_path, remote_dest_dir, is_dir))
-            thread.daemon = True
-            thread.start()
+        self._log_message(_("Queueing upload for: {path}").format(path=local_path))
+        self.transfer_executor.submit(self._upload_worker, local_path, remote_dest_dir, is_dir)
 
     def _upload_worker(self, local_path, remote_dest_dir, is_dir):
         """Uploads a file or directory recursively (runs in a thread)."""
         if not self.sftp_client: return
         basename = os.path.basename(local_path)
-        remote_path = os.path.join(remote_dest_dir, basename).replace('\\', '/')
+        # Remote paths are joined with posixpath: it only ever uses '/'
+        remote_path = posixpath.join(remote_dest_dir, basename)
 
         try:
             if not is_dir: # It's a file
-                file_size = os.path.getsize(local_path)
-                progress_callback = self._make_progress_callback(basename, file_size)
                 self._log_message(_("Uploading file {local} to {remote}...").format(local=local_path, remote=remote_path))
-                self.sftp_client.put(local_path, remote_path, callback=progress_callback)
+                self._put_file(local_path, remote_path, os.path.getsize(local_path))
                 self._log_message(_("File upload successful: {basename}").format(basename=basename))
             else: # It's a directory
                 self._log_message(_("Uploading directory {local} to {remote}...").format(local=local_path, remote=remote_path))
-                self.sftp_client.mkdir(remote_path)
-                for dirpath, subdirs, filenames in os.walk(local_path):
-                    relative_path = os.path.relpath(dirpath, local_path)
-                    if relative_path == '.':
-                        remote_dir = remote_path
+                remote_dirs = [remote_path]
+                files = [] # (local_file, remote_file, size)
+                def skip_dir(e):
+                    self._log_message(_("Skipping unreadable directory: {e}").format(e=e), is_error=True)
+                for local_file, relative_path, file_size in _iter_tree(local_path, onerror=skip_dir):
+                    remote_file = posixpath.join(remote_path, relative_path)
+                    if file_size is None:
+                        remote_dirs.append(remote_file)
                     else:
-                        remote_dir = os.path.join(remote_path, relative_path).replace('\\', '/')
-
-                    for sub_dir in subdirs:
-                        try:
-                            self.sftp_client.mkdir(os.path.join(remote_dir, sub_dir).replace('\\', '/'))
-                        except Exception:
-                            pass # Directory might already exist
-
-                    for filename in filenames:
-                        local_file = os.path.join(dirpath, filename)
-                        remote_file = os.path.join(remote_dir, filename).replace('\\', '/')
-                        file_size = os.path.getsize(local_file)
-                        progress_callback = self._make_progress_callback(filename, file_size)
-                        self.sftp_client.put(local_file, remote_file, callback=progress_callback)
+                        files.append((local_file, remote_file, file_size))
+
+                self._make_remote_dirs(remote_dirs)
+                # All directories exist now, so the files can go in parallel
+                with ThreadPoolExecutor(max_workers=self._transfer_channels) as pool:
+                    futures = [pool.submit(self._put_file, *f) for f in files]
+                    failed = self._log_failures(futures, [f[0] for f in files], _("Failed to upload {path}: {e}"))
+                if failed:
+                    raise IOError(_("{failed} of {total} files could not be uploaded").format(failed=failed, total=len(files)))
                 self._log_message(_("Directory upload successful: {basename}").format(basename=basename))
 
-            # Refresh remote view on success
-            self.ui_queue.put(lambda: self._load_remote_directory_threaded(self.current_remote_path))
-
         except Exception as e:
             self._log_message(_("Upload failed for {basename}: {e}").format(basename=basename, e=e), is_error=True)
+        finally:
+            # Refresh remote view, also after a partial upload: the cached
+            # listing is stale either way
+            GLib.idle_add(self._forget_remote, remote_path)
+            GLib.idle_add(lambda: self._load_remote_directory_threaded(self.current_remote_path))
+
+    def _make_remote_dirs(self, remote_dirs):
+        """
+        Creates whichever of remote_dirs don't exist yet, parents first.
+        Existing ones cost one stat(); inside a directory we just created
+        nothing can exist, so those are created without asking.
+        """
+        created = set()
+        for remote_dir in sorted(remote_dirs, key=len): # A parent is shorter than its children
+            if posixpath.dirname(remote_dir) not in created:
+                try:
+                    self.sftp_client.stat(remote_dir)
+                    continue # Already there
+                except IOError:
+                    pass
+            self.sftp_client.mkdir(remote_dir)
+            created.add(remote_dir)
+
+    def _put_file(self, local_file, remote_file, file_size):
+        """Uploads one file (runs in a worker or pool thread)."""
+        progress_callback = partial(self._progress, local_file, file_size)
+        try:
+            with self._sftp() as sftp:
+                self._put_streamed(sftp, local_file, remote_file, progress_callback)
+        finally:
+            self._end_progress(local_file)
+
+    @staticmethod
+    def _put_streamed(sftp, local_file, remote_file, callback):
+        """
+        Uploads a file in _TRANSFER_BLOCK pieces, read into one reused buffer,
+        instead of put()'s 32 KiB reads, with one progress call per piece.
+        Writes are pipelined, so none of them waits for the server's answer
+        to the one before. The file is read, not memory-mapped: an editor may
+        truncate it while it is sent, and reading a mapping past the new end
+        would kill the process with SIGBUS.
+        """
+        buf = bytearray(_TRANSFER_BLOCK)
+        view = memoryview(buf)
+        size = 0
+        with open(local_file, 'rb', buffering=0) as f, sftp.open(remote_file, 'wb') as remote:
+            remote.set_pipelined(True)
+            total = os.fstat(f.fileno()).st_size
+            while n := f.readinto(buf):
+                remote.write(view[:n]) # Copied into SFTPFile's buffer, so buf can be refilled
+                size += n
+                callback(size, total)
+        # Same check as put(confirm=True)
+        remote_size = sftp.stat(remote_file).st_size
+        if remote_size != size:
+            raise IOError(f"size mismatch in put!  {remote_size} != {size}")
 
     def on_download_clicked(self, button):
         """Handles the click on the Download (<) button."""
-        selection = self.remote_view.get_selection()
-        model, paths = selection.get_selected_rows()
-        if not paths:
+        entry = self._selected_entry(self.remote_view)
+        if entry is None:
             self._log_message(_("No remote files selected for download."), is_error=True)
             return
 
-        for path in paths:
-            tree_iter = model.get_iter(path)
-            remote_path = model.get_value(tree_iter, COL_FULL_PATH)
-            is_dir = model.get_value(tree_iter, COL_IS_DIR)
-            local_dest_dir = self.current_local_path
-
-            self._log_message(_("Queueing download for: {path}").format(path=remote_path))
-            thread = threading.Thread(target=self._download_worker, args=(remote_path, local_dest_dir, is_dir))
-            thread.daemon = True
-            thread.start()
-
-    def _download_worker(self, remote_path, local_dest_dir, is_dir):
-        """Downloads a file or directory recursively (runs in a thread)."""
+        remote_path = entry.full_path
+        is_dir = entry.is_dir
+        local_dest_dir = self.current_local_path
+
+        self._log_message(_("Queueing download for: {path}").format(path=remote_path))
+        self.transfer_executor.submit(self._download_worker, remote_path, local_dest_dir, is_dir, entry.size_bytes)
+
+    def _download_worker(self, remote_path, local_dest_dir, is_dir, size_bytes=-1):
+        """
+        Downloads a file or directory recursively (runs in a thread).
+        size_bytes is the file's size from the listing; only if it is
+        unknown (-1) does the file have to be stat()ed first.
+        """
         if not self.sftp_client: return
-        basename = os.path.basename(remote_path)
+        basename = posixpath.basename(remote_path)
         local_path = os.path.join(local_dest_dir, basename)
 
         try:
             if not is_dir: # It's a file
-                file_attrs = self.sftp_client.stat(remote_path)
-                progress_callback = self._make_progress_callback(basename, file_attrs.st_size)
+                if size_bytes < 0:
+                    size_bytes = self.sftp_client.stat(remote_path).st_size
                 self._log_message(_("Downloading file {remote} to {local}...").format(remote=remote_path, local=local_path))
-                self.sftp_client.get(remote_path, local_path, callback=progress_callback)
+                self._download_file(remote_path, local_path, size_bytes)
                 self._log_message(_("File download successful: {basename}").format(basename=basename))
             else: # It's a directory
                 self._log_message(_("Downloading directory {remote} to {local}...").format(remote=remote_path, local=local_path))
-                os.makedirs(local_path, exist_ok=True)
-                for item in self.sftp_client.listdir_attr(remote_path):
-                    self._download_worker(os.path.join(remote_path, item.filename).replace('\\', '/'), local_path, stat.S_ISDIR(item.st_mode))
+                with ThreadPoolExecutor(max_workers=self._transfer_channels) as pool:
+                    # 1. List the whole tree, 2. create it locally, 3. fetch the files in parallel
+                    local_dirs, files = self._walk_remote(pool, remote_path, local_path)
+                    for local_dir in local_dirs:
+                        os.makedirs(local_dir, exist_ok=True)
+                    futures = [pool.submit(self._download_file, *f) for f in files]
+                    failed = self._log_failures(futures, [f[0] for f in files], _("Failed to download {path}: {e}"))
+                if failed:
+                    raise IOError(_("{failed} of {total} files could not be downloaded").format(failed=failed, total=len(files)))
                 self._log_message(_("Directory download successful: {basename}").format(basename=basename))
 
-            # Refresh local view on success
-            self.ui_queue.put(lambda: self._load_local_directory(self.current_local_path))
-
         except Exception as e:
             self._log_message(_("Download failed for {basename}: {e}").format(basename=basename, e=e), is_error=True)
+        finally:
+            # Refresh local view once per download, also after a partial one,
+            # and only if it still shows the directory downloaded into.
+            GLib.idle_add(self._refresh_local_dir, local_dest_dir)
 
-    def _format_size(self, size_bytes):
+    def _log_failures(self, futures, paths, message):
+        """
+        Waits for every future of a batch, logs each failed one with message
+        (formatted with its path and error) and returns how many failed.
+        """
+        failed = 0
+        for path, future in zip(paths, futures):
+            e = future.exception() # Blocks until this one is done
+            if e is not None:
+                self._log_message(message.format(path=path, e=e), is_error=True)
+                failed += 1
+        return failed
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _format_size(size_bytes):
         """Formats a size in bytes to a human-readable string."""
         if size_bytes == 0:
             return "0 B"
-        size_name = ("B", "KiB", "MiB", "GiB", "TiB")
-        i = int(size_bytes.bit_length() / 10)
-        p = 1024 ** i
-        s = round(size_bytes / p, 1)
-        return f"{s} {size_name[i]}"
+        i = min(size_bytes.bit_length() // 10, len(_SIZE_NAMES) - 1)
+        s = round(size_bytes / (1 << 10 * i), 1)
+        return f"{s} {_SIZE_NAMES[i]}"
 
-    def _format_date(self, timestamp):
+    @staticmethod
+    def _format_date(timestamp):
         """Formats a UNIX timestamp to a human-readable string."""
-        dt_object = datetime.datetime.fromtimestamp(timestamp)
+        # Only minutes are shown, so files changed in the same minute share a cache entry
+        return SftpWidget._format_minute(int(timestamp // 60))
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _format_minute(minute):
+        dt_object = datetime.datetime.fromtimestamp(minute * 60)
         return dt_object.strftime("%Y-%m-%d %H:%M")
 
+    # Text of the non-name cells per column (sort key, None for Permissions).
+    # Formatting at bind time means only the visible rows are ever formatted.
+    _CELL_TEXT = {
+        "size": lambda e: "<DIR>" if e.is_dir else SftpWidget._format_size(e.size_bytes),
+        "date": lambda e: SftpWidget._format_date(e.modified_ts),
+        None: lambda e: _filemode(e.perms_mode),
+    }
+
     def on_local_up_clicked(self, button):
         """Handles the 'Up' button click."""
         parent_path = os.path.dirname(self.current_local_path)
         if parent_path != self.current_local_path: # Avoid getting stuck at "/"
-            self._load_local_directory(parent_path)
+            self._load_local_directory(parent_path, use_cache=True)
 
     def on_local_refresh_clicked(self, button):
         """Handles the 'Refresh' button click for the local panel."""
@@ -737,20 +1220,19 @@ class SftpWidget(Gtk.Box):
         """Handles Enter press in the path entry."""
         new_path = entry.get_text().strip()
         if os.path.isdir(new_path):
-            self._load_local_directory(new_path)
+            self._load_local_directory(new_path, use_cache=True)
         else:
             # Maybe show an error tooltip
             entry.set_text(self.current_local_path)
 
-    def on_local_row_activated(self, tree_view, path, column):
+    def on_local_row_activated(self, view, position):
         """Handles double-click on a file or directory."""
-        model = tree_view.get_model()
-        tree_iter = model.get_iter(path)
-        is_dir = model.get_value(tree_iter, COL_IS_DIR)
-        full_path = model.get_value(tree_iter, COL_FULL_PATH)
+        entry = view.get_model().get_item(position)
+        is_dir = entry.is_dir
+        full_path = entry.full_path
 
         if is_dir:
-            self._load_local_directory(full_path)
+            self._load_local_directory(full_path, use_cache=True)
         else: # It's a file, open it with the default application
             try:
                 gfile = Gio.File.new_for_path(full_path)
@@ -763,37 +1245,112 @@ class SftpWidget(Gtk.Box):
 
     def on_remote_up_clicked(self, button):
         if not self.current_remote_path: return
-        parent_path = os.path.dirname(self.current_remote_path)
+        parent_path = posixpath.dirname(self.current_remote_path)
         if parent_path != self.current_remote_path:
-            self._load_remote_directory_threaded(parent_path)
+            self._load_remote_directory_threaded(parent_path, use_cache=True)
 
     def on_remote_path_activated(self, entry):
-        self._load_remote_directory_threaded(entry.get_text().strip())
+        self._load_remote_directory_threaded(entry.get_text().strip(), use_cache=True)
 
-    def on_remote_row_activated(self, tree_view, path, column):
-        model = tree_view.get_model()
-        tree_iter = model.get_iter(path)
-        is_dir = model.get_value(tree_iter, COL_IS_DIR)
-        full_path = model.get_value(tree_iter, COL_FULL_PATH)
+    def on_remote_row_activated(self, view, position):
+        entry = view.get_model().get_item(position)
+        is_dir = entry.is_dir
+        full_path = entry.full_path
         if is_dir:
-            self._load_remote_directory_threaded(full_path)
+            self._load_remote_directory_threaded(full_path, use_cache=True)
         else: # It's a file, start the download-edit-upload cycle
             self._log_message(_("Opening remote file for editing: {path}").format(path=full_path))
-            thread = threading.Thread(target=self._remote_edit_worker, args=(full_path,))
-            thread.daemon = True
-            thread.start()
+            self.transfer_executor.submit(self._remote_edit_worker, full_path)
+
+    def _walk_remote(self, pool, remote_root, local_root):
+        """
+        Lists a remote tree breadth-first. All directories of one level are
+        listed at once through the pool, each on a transfer session. Returns
+        the local directories to create (parents first) and the files as
+        (remote_file, local_file, size).
+        """
+        local_dirs, files = [local_root], []
+        level = [(remote_root, local_root)]
+        while level:
+            listings = pool.map(self._listdir_attr, [remote_dir for remote_dir, local_dir in level])
+            next_level = []
+            for (remote_dir, local_dir), attrs in zip(level, listings):
+                for attr in attrs:
+                    remote_file = posixpath.join(remote_dir, attr.filename)
+                    local_file = os.path.join(local_dir, attr.filename)
+                    if stat.S_ISDIR(attr.st_mode):
+                        local_dirs.append(local_file)
+                        next_level.append((remote_file, local_file))
+                    else:
+                        files.append((remote_file, local_file, attr.st_size))
+            level = next_level
+        return local_dirs, files
+
+    def _listdir_attr(self, remote_dir):
+        """listdir_attr() on a transfer session (runs in a pool thread)."""
+        with self._sftp() as sftp:
+            return sftp.listdir_attr(remote_dir)
+
+    def _download_file(self, remote_file, local_file, file_size):
+        """Downloads one file with progress logging (runs in a worker or pool thread)."""
+        progress_callback = partial(self._progress, remote_file, file_size)
+        try:
+            self._get_file(remote_file, local_file, file_size, progress_callback)
+        finally:
+            self._end_progress(remote_file)
+
+    def _get_file(self, remote_path, local_path, file_size, callback=None):
+        """
+        Downloads one file with prefetched reads: up to sftp.prefetch_requests
+        of them are in flight at once (like sftp -R), instead of each read
+        waiting for the one before. Data goes to disk in _TRANSFER_BLOCK pieces,
+        written straight to the fd with no Python file object in between.
+        """
+        max_requests = self.settings.get("sftp.prefetch_requests")
+        with self._sftp() as sftp, sftp.open(remote_path, 'rb') as remote:
+            try:
+                remote.prefetch(file_size, max_concurrent_requests=max_requests)
+            except TypeError: # paramiko < 3.3 has no limit and sends all reads at once
+                remote.prefetch(file_size)
+            fd = os.open(local_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+            try:
+                # Reserve the whole file up front, so the filesystem doesn't
+                # grow it (and fragment it) one block at a time.
+                if file_size > 0 and hasattr(os, 'posix_fallocate'):
+                    try:
+                        os.posix_fallocate(fd, 0, file_size)
+                    except OSError:
+                        pass # Not supported by this filesystem, just write
+                received = 0
+                while chunk := remote.read(_TRANSFER_BLOCK):
+                    view = memoryview(chunk)
+                    while view: # os.write() may write less than asked
+                        view = view[os.write(fd, view):]
+                    received += len(chunk)
+                    if callback:
+                        callback(received, file_size)
+                if received < file_size:
+                    # The file shrank since it was listed: cut off the part
+                    # posix_fallocate() reserved, or it would end in NULs.
+                    os.ftruncate(fd, received)
+            finally:
+                os.close(fd)
+            # Same check as get(). file_size may come from a listing taken a
+            # while ago, so a mismatch is checked against the file as it is now.
+            if received != file_size and received != sftp.stat(remote_path).st_size:
+                raise IOError(f"size mismatch in get!  {received} != {file_size}")
 
     def _remote_edit_worker(self, remote_path):
         """Downloads a remote file to a temp location, opens it, and monitors for changes."""
         if not self.sftp_client: return
 
-        basename = os.path.basename(remote_path)
+        basename = posixpath.basename(remote_path)
         local_temp_path = os.path.join(self.temp_dir, basename)
 
         try:
             # 1. Download the file
             self._log_message(_("Downloading {basename} to temporary location...").format(basename=basename))
-            self.sftp_client.get(remote_path, local_temp_path)
+            self._get_file(remote_path, local_temp_path, self.sftp_client.stat(remote_path).st_size)
 
             # 2. Open the local temporary file (in the main thread)
             def open_and_monitor():
@@ -813,7 +1370,7 @@ class SftpWidget(Gtk.Box):
                 except Exception as e:
                     self._log_message(_("Failed to open or monitor temporary file: {e}").format(e=e), is_error=True)
 
-            self.ui_queue.put(open_and_monitor)
+            GLib.idle_add(open_and_monitor)
 
         except Exception as e:
             self._log_message(_("Failed to download file for editing: {e}").format(e=e), is_error=True)
@@ -822,12 +1379,25 @@ class SftpWidget(Gtk.Box):
         """Callback when a monitored temporary file is changed."""
         # We are interested in actual content changes, not just closing.
         if event_type == Gio.FileMonitorEvent.CHANGES_DONE_HINT:
-            self._log_message(_("Detected changes in {basename}. Uploading back to server...").format(basename=os.path.basename(local_path)))
-            # Start the upload in a background thread to avoid blocking the UI
-            # We can reuse the existing upload worker.
-            thread = threading.Thread(target=self._upload_worker, args=(local_path, os.path.dirname(remote_path), False))
-            thread.daemon = True
-            thread.start()
+            # Restart the wait, so a burst of events ends in one upload
+            source_id = self._pending_uploads.pop(local_path, None)
+            if source_id is not None:
+                GLib.source_remove(source_id)
+            self._pending_uploads[local_path] = GLib.timeout_add(
+                _REUPLOAD_DELAY, self._reupload_temp_file, local_path, remote_path)
+
+    def _reupload_temp_file(self, local_path, remote_path):
+        """Uploads an edited temp file back, once no upload of it is running."""
+        if local_path in self._uploading:
+            return True # Still sending the last save, check again on the next tick
+        del self._pending_uploads[local_path]
+        self._uploading.add(local_path)
+        self._log_message(_("Detected changes in {basename}. Uploading back to server...").format(basename=os.path.basename(local_path)))
+        # Upload in the background to avoid blocking the UI
+        # We can reuse the existing upload worker.
+        future = self.transfer_executor.submit(self._upload_worker, local_path, posixpath.dirname(remote_path), False)
+        future.add_done_callback(lambda f: GLib.idle_add(self._uploading.discard, local_path))
+        return False
 
     def on_local_view_key_pressed(self, controller, keyval, keycode, modifier):
         """Handles key presses on the local file list, specifically Backspace."""
@@ -845,31 +1415,33 @@ class SftpWidget(Gtk.Box):
 
     def _log_message(self, message, is_error=False):
         """Appends a message to the log view in a thread-safe way."""
-        def append_log():
-            scroll_adj = self.log_view.get_parent().get_vadjustment()
-            is_at_bottom = (scroll_adj.get_value() >= scroll_adj.get_upper() - scroll_adj.get_page_size() - 5) # 5px tolerance
-
-            buf = self.log_view.get_buffer()
-            timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-            log_line = f"[{timestamp}] {message}\n"
-            end_iter = buf.get_end_iter()
-            buf.insert(end_iter, log_line)
-
-            if is_at_bottom:
-                def do_scroll():
-                    end_iter = self.log_view.get_buffer().get_end_iter()
-                    self.log_view.scroll_to_iter(end_iter, 0.0, True, 0.0, 1.0)
-                GLib.idle_add(do_scroll)
-
-            # TODO: Add color tags for errors
-        self.ui_queue.put(append_log)
-
-    def _process_ui_queue(self):
-        """Process UI updates from background threads."""
-        while not self.ui_queue.empty():
-            callback = self.ui_queue.get()
-            callback()
-        return True # Keep the timeout running
+        line = f"{_log_timestamp(int(time.time()))}{message}\n"
+        with self._log_lock:
+            self._log_buf.append(line)
+            if self._log_flush_scheduled:
+                return # The pending flush picks this line up too
+            self._log_flush_scheduled = True
+        GLib.timeout_add(_LOG_FLUSH_INTERVAL, self._flush_log)
+        # TODO: Add color tags for errors
+
+    def _flush_log(self):
+        """Writes all buffered log lines to the log view with a single insert."""
+        with self._log_lock:
+            text = "".join(self._log_buf)
+            self._log_buf.clear()
+            self._log_flush_scheduled = False
+
+        scroll_adj = self.log_view.get_parent().get_vadjustment()
+        is_at_bottom = (scroll_adj.get_value() >= scroll_adj.get_upper() - scroll_adj.get_page_size() - 5) # 5px tolerance
+
+        buf = self.log_view.get_buffer()
+        buf.insert(buf.get_end_iter(), text)
+
+        if is_at_bottom:
+            # A mark is scrolled to once the new lines have been laid out;
+            # scroll_to_iter() right after an insert lands short of the end.
+            self.log_view.scroll_mark_onscreen(self._log_end_mark)
+        return False # Run once; the next message schedules a new flush
 
     def on_widget_destroy(self, *args):
         """Clean up resources when the widget is destroyed."""
@@ -878,17 +1450,24 @@ class SftpWidget(Gtk.Box):
             GLib.source_remove(self.connection_check_timer_id)
             self.connection_check_timer_id = None
 
+        for source_id in self._pending_uploads.values():
+            GLib.source_remove(source_id)
+        self._pending_uploads.clear()
+        self.transfer_executor.shutdown(wait=False, cancel_futures=True) # Drop transfers not started yet
+        self.metadata_executor.shutdown(wait=False, cancel_futures=True)
         if self.sftp_client: self.sftp_client.close()
-        if self.ssh_client: self.ssh_client.close()
+        self._close_sftp_pool()
+        if self.transport: self.transport.close()
 
         for monitor, _ in self.file_monitors.values():
             monitor.cancel()
         self.file_monitors.clear()
-        try:
-            shutil.rmtree(self.temp_dir)
-            self._log_message(f"Cleaned up temporary directory: {self.temp_dir}")
-        except Exception as e:
-            self._log_message(f"Failed to clean up temporary directory {self.temp_dir}: {e}", is_error=True)
+        if self._temp_dir is not None: # Nothing was ever edited otherwise
+            try:
+                shutil.rmtree(self._temp_dir)
+                self._log_message(f"Cleaned up temporary directory: {self._temp_dir}")
+            except Exception as e:
+                self._log_message(f"Failed to clean up temporary directory {self._temp_dir}: {e}", is_error=True)
 
         self._log_message("SFTP connection closed.")
 
@@ -927,19 +1506,18 @@ class SftpWidget(Gtk.Box):
         # Stop the event from propagating further to prevent selection issues.
         gesture.set_state(Gtk.EventSequenceState.CLAIMED)
 
-        path_info = view.get_path_at_pos(int(x), int(y))
-        if not path_info:
-            view.get_selection().unselect_all()
+        selection = view.get_model()
+        position = self._position_at(view, x, y)
+        if position is None:
+            selection.unselect_all()
             return
 
-        path, col, _, _ = path_info
         # It's crucial to select the row *before* showing the menu.
-        view.get_selection().select_path(path)
+        selection.select_item(position, True)
         self.last_clicked_view = view
-        model = view.get_model()
 
         chmod_action = self.sftp_action_group.lookup_action("chmod-file")
-        if model.get_value(model.get_iter(path), COL_NAME) == "..":
+        if selection.get_item(position).name == "..":
             if chmod_action: chmod_action.set_enabled(False)
         else:
             if chmod_action: chmod_action.set_enabled(True)
@@ -956,48 +1534,49 @@ class SftpWidget(Gtk.Box):
     def on_rename_activated(self, action, param):
         """Handles the 'Rename' action from the context menu."""
         if not self.last_clicked_view: return
-        selection = self.last_clicked_view.get_selection()
-        model, tree_iter = selection.get_selected()
-        if not tree_iter: return
+        entry = self._selected_entry(self.last_clicked_view)
+        if entry is None: return
 
-        old_full_path = model.get_value(tree_iter, COL_FULL_PATH)
-        old_name = model.get_value(tree_iter, COL_NAME)
+        old_full_path = entry.full_path
+        old_name = entry.name
 
-        dialog = InputDialog(self.get_root(), title=_("Rename"), message=_("New name for '{old_name}':").format(old_name=old_name), default_text=old_name)
+        dialog = InputDialog.reuse(self.get_root(), title=_("Rename"), message=_("New name for '{old_name}':").format(old_name=old_name), default_text=old_name)
         dialog.run_async(lambda new_name: self._execute_rename(old_full_path, new_name))
 
     def _execute_rename(self, old_path, new_name):
         """Performs the actual rename operation."""
-        if not new_name or os.path.basename(old_path) == new_name: return
-
-        new_path = os.path.join(os.path.dirname(old_path), new_name)
         is_local = (self.last_clicked_view == self.local_view)
+        path_module = os.path if is_local else posixpath # Remote paths are always '/'-separated
+        store = self.local_store if is_local else self.remote_store
+        if not new_name or path_module.basename(old_path) == new_name: return
+
+        new_path = path_module.join(path_module.dirname(old_path), new_name)
 
         def rename_task():
             try:
                 if is_local:
                     os.rename(old_path, new_path)
-                    self.ui_queue.put(lambda: self._load_local_directory(self.current_local_path))
+                    GLib.idle_add(self._forget_local, old_path)
                 else: # Remote
                     self.sftp_client.rename(old_path, new_path)
-                    self.ui_queue.put(lambda: self._load_remote_directory_threaded(self.current_remote_path))
-                self._log_message(_("Renamed '{old}' to '{new}'").format(old=os.path.basename(old_path), new=new_name))
+                    GLib.idle_add(self._forget_remote, old_path, new_path)
+                # A replaced target loses its row, then the renamed row takes its place
+                GLib.idle_add(self._patch_row, store, new_path)
+                GLib.idle_add(partial(self._patch_row, store, old_path, name=new_name, full_path=new_path))
+                self._log_message(_("Renamed '{old}' to '{new}'").format(old=path_module.basename(old_path), new=new_name))
             except Exception as e:
                 self._log_message(_("Rename failed: {e}").format(e=e), is_error=True)
 
-        thread = threading.Thread(target=rename_task)
-        thread.daemon = True
-        thread.start()
+        self.metadata_executor.submit(rename_task)
 
     def on_delete_activated(self, action, param):
         """Handles the 'Delete' action from the context menu."""
         if not self.last_clicked_view: return
-        selection = self.last_clicked_view.get_selection()
-        model, tree_iter = selection.get_selected()
-        if not tree_iter: return
+        entry = self._selected_entry(self.last_clicked_view)
+        if entry is None: return
 
-        full_path = model.get_value(tree_iter, COL_FULL_PATH)
-        is_dir = model.get_value(tree_iter, COL_IS_DIR)
+        full_path = entry.full_path
+        is_dir = entry.is_dir
         is_local = (self.last_clicked_view == self.local_view)
 
         # Determine if the directory is empty (for local only, remote is harder to check without recursion)
@@ -1033,6 +1612,7 @@ class SftpWidget(Gtk.Box):
 
     def _execute_delete(self, full_path, is_dir, is_local):
         """Performs the actual delete operation in a thread."""
+        store = self.local_store if is_local else self.remote_store
         def delete_task():
             try:
                 if is_local:
@@ -1040,32 +1620,51 @@ class SftpWidget(Gtk.Box):
                         shutil.rmtree(full_path) # Recursive delete for local directories
                     else:
                         os.remove(full_path)
-                    self.ui_queue.put(lambda: self._load_local_directory(self.current_local_path))
+                    GLib.idle_add(self._forget_local, full_path)
                 else: # Remote
                     if is_dir:
                         self._sftp_rm_recursive(full_path) # Recursive delete for remote directories
                     else:
                         self.sftp_client.remove(full_path)
-                    self.ui_queue.put(lambda: self._load_remote_directory_threaded(self.current_remote_path))
+                    GLib.idle_add(self._forget_remote, full_path)
+                GLib.idle_add(self._patch_row, store, full_path)
                 self._log_message(_("Deleted: {path}").format(path=full_path))
             except Exception as e:
                 self._log_message(_("Delete failed: {e}").format(e=e), is_error=True)
 
-        thread = threading.Thread(target=delete_task)
-        thread.daemon = True
-        thread.start()
+        self.metadata_executor.submit(delete_task)
 
     def _sftp_rm_recursive(self, path):
-        """Recursively removes a directory and its contents on the remote server."""
+        """
+        Recursively removes a directory and its contents on the remote server.
+        The tree is listed first; then the files are removed by a few threads
+        at once on sftp_client, and the directories bottom-up. The transfer
+        sessions are left alone, so a delete neither waits for running
+        transfers nor slows them down.
+        """
         if not self.sftp_client: return
-        
-        for item in self.sftp_client.listdir_attr(path):
-            full_remote_path = os.path.join(path, item.filename).replace('\\', '/')
-            if stat.S_ISDIR(item.st_mode):
-                self._sftp_rm_recursive(full_remote_path)
-            else:
-                self.sftp_client.remove(full_remote_path)
-        self.sftp_client.rmdir(path)
+
+        dirs, files = [], []
+        stack = [path] # Iterative, so deep trees can't hit the recursion limit
+        while stack:
+            current = stack.pop()
+            dirs.append(current) # Always after its parent
+            for item in self.sftp_client.listdir_attr(current):
+                full_remote_path = posixpath.join(current, item.filename)
+                if stat.S_ISDIR(item.st_mode):
+                    stack.append(full_remote_path)
+                else:
+                    files.append(full_remote_path)
+
+        # The requests of all threads are pipelined over the one channel
+        with ThreadPoolExecutor(max_workers=_REMOVE_THREADS, thread_name_prefix="sftp-remove") as pool:
+            futures = [pool.submit(self.sftp_client.remove, f) for f in files]
+        # Leaving the with block waited for every remove, failed or not
+        failed = self._log_failures(futures, files, _("Failed to delete {path}: {e}"))
+        if failed:
+            raise IOError(_("{failed} of {total} files could not be deleted").format(failed=failed, total=len(files)))
+        for remote_dir in reversed(dirs): # Children before their parents
+            self.sftp_client.rmdir(remote_dir)
         self._log_message(_("Recursively deleted remote directory: {path}").format(path=path))
 
 
@@ -1083,43 +1682,43 @@ class SftpWidget(Gtk.Box):
         """Handles the 'Change Permissions' action."""
         if not self.last_clicked_view: return
 
-        selection = self.last_clicked_view.get_selection()
-        model, tree_iter = selection.get_selected()
-        if not tree_iter: return
+        entry = self._selected_entry(self.last_clicked_view)
+        if entry is None: return
 
-        full_path = model.get_value(tree_iter, COL_FULL_PATH)
-        current_mode = model.get_value(tree_iter, COL_PERMS_MODE)
+        full_path = entry.full_path
+        current_mode = entry.perms_mode
 
         dialog = PermissionsDialog(self.get_root(), initial_mode=current_mode)
-        dialog.run_async(lambda new_mode: self._execute_chmod(full_path, new_mode))
+        dialog.run_async(lambda new_mode: self._execute_chmod(full_path, new_mode, current_mode))
 
-    def _execute_chmod(self, path, new_mode):
+    def _execute_chmod(self, path, new_mode, current_mode):
         """Applies new permissions to a remote file/directory."""
         if new_mode is None: return # Dialog was cancelled
         is_local = (self.last_clicked_view == self.local_view)
+        store = self.local_store if is_local else self.remote_store
+        # The row keeps its file type bits, only the permissions change
+        shown_mode = (current_mode & ~0o7777) | (new_mode & 0o7777)
 
         def chmod_task():
             try:
                 if is_local:
                     os.chmod(path, new_mode)
-                    # Refresh local view
-                    self.ui_queue.put(lambda: self._load_local_directory(self.current_local_path))
+                    GLib.idle_add(self._forget_local, path)
                 else: # Remote
                     self.sftp_client.chmod(path, new_mode)
-                    # Refresh remote view
-                    self.ui_queue.put(lambda: self._load_remote_directory_threaded(self.current_remote_path))
+                    GLib.idle_add(self._forget_remote, path)
+                # Update just this row instead of refreshing the view
+                GLib.idle_add(partial(self._patch_row, store, path, perms_mode=shown_mode))
 
                 self._log_message(_("Permissions changed for {path} to {mode}").format(path=path, mode=oct(new_mode)[2:]))
             except Exception as e:
                 self._log_message(_("Failed to change permissions for {path}: {e}").format(path=path, e=e), is_error=True)
 
-        thread = threading.Thread(target=chmod_task)
-        thread.daemon = True
-        thread.start()
+        self.metadata_executor.submit(chmod_task)
 
     def _on_view_scroll(self, controller, dx, dy, scrolled_window):
         """
-        Handles scroll events on the TreeViews to prevent them from propagating
+        Handles scroll events on the file views to prevent them from propagating
         to the parent notebook when the view is already at its limit.
         """
         adj = scrolled_window.get_vadjustment()
@@ -124,15 +124,17 @@ class ThongSSHWindow(Adw.ApplicationWindow):
 
 
         # --- Sorting setup ---
+        name_col, type_col = COL_NAME, COL_TYPE # Locals: this runs per comparison
         def sort_func(model, iter1, iter2, user_data):
-            type1 = model.get_value(iter1, COL_TYPE)
-            type2 = model.get_value(iter2, COL_TYPE)
+            get_value = model.get_value
+            type1 = get_value(iter1, type_col)
+            type2 = get_value(iter2, type_col)
 
             if type1 == "group" and type2 == "host": return -1
             if type1 == "host" and type2 == "group": return 1
 
-            name1 = model.get_value(iter1, COL_NAME).lower()
-            name2 = model.get_value(iter2, COL_NAME).lower()
+            name1 = get_value(iter1, name_col).lower()
+            name2 = get_value(iter2, name_col).lower()
 
             if name1 < name2: return -1
             elif name1 > name2: return 1
@@ -270,12 +272,14 @@ class ThongSSHWindow(Adw.ApplicationWindow):
         """Парсит Gtk.TreeStore и сохраняет его в hosts.json."""
         logging.debug("Saving tree to config...")
 
+        type_col, data_col = COL_TYPE, COL_DATA
+
         def iter_tree(model, tree_iter):
             """Рекурсивно парсит Gtk.TreeStore в dict."""
             children = []
             while tree_iter:
-                node_type = model.get_value(tree_iter, COL_TYPE)
-                data = model.get_value(tree_iter, COL_DATA)
+                node_type = model.get_value(tree_iter, type_col)
+                data = model.get_value(tree_iter, data_col)
                 path = model.get_path(tree_iter)
 
                 if node_type == "group":
@@ -395,8 +399,9 @@ class ThongSSHWindow(Adw.ApplicationWindow):
             self.update_search_ui()
             return
 
+        name_col = COL_NAME
         def find_matches(model, path, iter):
-            name = model.get_value(iter, COL_NAME)
+            name = model.get_value(iter, name_col)
             if regex.search(name):
                 # Save the path, not the iterator, as it's stable
                 self.search_results.append(path.copy())
@@ -889,6 +894,7 @@ class ThongSSHWindow(Adw.ApplicationWindow):
         """Placeholder for the settings dialog."""
         from .dialogs import SettingsDialog
         logging.info("Settings dialog called.")
+        self.settings_manager.reload_if_changed() # Show hand edits, if any
         dialog = SettingsDialog(self, self.settings_manager)
         dialog.present()
 
@@ -937,8 +943,7 @@ class ThongSSHWindow(Adw.ApplicationWindow):
                 self.rebuild_config_and_save() # Saving will work with main_tree_store
             dialog.destroy()
 
-        dialog.connect("response", on_response)
-        dialog.present()
+        dialog.run_async(on_response)
 
     def on_menu_connect_host(self, action, param):
         """Handles the 'Connect' action from the context menu."""
@@ -987,8 +992,7 @@ class ThongSSHWindow(Adw.ApplicationWindow):
                 self.rebuild_config_and_save()
             dialog.destroy()
 
-        dialog.connect("response", on_response)
-        dialog.present()
+        dialog.run_async(on_response)
 
     def on_menu_clone_host(self, action, param):
         """Callback for the 'win.clone' GAction."""
@@ -1055,8 +1059,7 @@ class ThongSSHWindow(Adw.ApplicationWindow):
                     self.rebuild_config_and_save()
             dialog.destroy()
 
-        dialog.connect("response", on_response)
-        dialog.present()
+        dialog.run_async(on_response)
 
 
     def on_menu_rename_group(self, action, param):
@@ -1070,24 +1073,20 @@ class ThongSSHWindow(Adw.ApplicationWindow):
             return
 
         old_name = model.get_value(tree_iter, COL_NAME)
-        dialog = InputDialog(self, title=_("Rename Group"), message=_("New name for '{old_name}':").format(old_name=old_name), default_text=old_name)
+        dialog = InputDialog.reuse(self, title=_("Rename Group"), message=_("New name for '{old_name}':").format(old_name=old_name), default_text=old_name)
 
-        def on_response(dialog, response):
-            if response == Gtk.ResponseType.OK:
-                new_name = dialog.get_text()
-                if new_name and new_name != old_name:
-                    # Re-get the iter just in case
-                    selection = self.tree_view.get_selection()
-                    model, tree_iter = selection.get_selected()
-                    if tree_iter:
-                        data = model.get_value(tree_iter, COL_DATA)
-                        data['name'] = new_name
-                        model.set(tree_iter, [COL_NAME, COL_DATA], [new_name, data])
-                        self.rebuild_config_and_save()
-            dialog.destroy()
+        def on_response(new_name): # None if cancelled
+            if new_name and new_name != old_name:
+                # Re-get the iter just in case
+                selection = self.tree_view.get_selection()
+                model, tree_iter = selection.get_selected()
+                if tree_iter:
+                    data = model.get_value(tree_iter, COL_DATA)
+                    data['name'] = new_name
+                    model.set(tree_iter, [COL_NAME, COL_DATA], [new_name, data])
+                    self.rebuild_config_and_save()
 
-        dialog.connect("response", on_response)
-        dialog.present()
+        dialog.run_async(on_response)
 
     def on_remove_selected_clicked(self, action_or_widget, param):
         """Callback for the 'win.delete' GAction AND the 'Delete' button."""
@@ -1161,7 +1160,7 @@ class ThongSSHWindow(Adw.ApplicationWindow):
 
         # Only ask for a username if it's an SSH connection and no user is specified.
         if config.get("protocol", "ssh") == "ssh" and "@" not in host_str:
-            dialog = InputDialog(
+            dialog = InputDialog.reuse(
                 self,
                 title=_("Username Required"),
                 message=_("Enter username for {host_str}").format(host_str=host_str)
@@ -1186,14 +1185,21 @@ class ThongSSHWindow(Adw.ApplicationWindow):
         if username_from_prompt:
              host_str = f"{username_from_prompt}@{host_str}"
 
+        if protocol == "ssh":
+            # ✨ Check for a password in the keyring. The lookup is a DBus call,
+            # so do it asynchronously and launch the session once it's back.
+            self.keyring.load_password_async(
+                config.get("name"),
+                lambda password: self._launch_session(config, host_str, password, existing_terminal_widget))
+        else:
+            self._launch_session(config, host_str, None, existing_terminal_widget)
+
+    def _launch_session(self, config, host_str, password, existing_terminal_widget=None):
+        """Third part: builds the command and spawns it in a terminal."""
         protocol = config.get("protocol", "ssh")
         cmd = []
-        password = None
 
         if protocol == "ssh":
-            # ✨ Check for a password in the keyring
-            password = self.keyring.load_password(config.get("name"))
-
             # --- 6.2. Сборка команды SSH ---
             if password and "@" in host_str:
                 # Use sshpass if a password is set
@@ -1281,20 +1287,11 @@ class ThongSSHWindow(Adw.ApplicationWindow):
             terminal.set_font(Pango.FontDescription.from_string(font_str))
 
             scheme = COLOR_SCHEMES.get(scheme_key)
-            if scheme and "colors" in scheme:
-                colors = scheme["colors"]
-                
-                # Helper function to correctly parse color strings
-                def parse_color(spec):
-                    rgba = Gdk.RGBA()
-                    rgba.parse(spec)
-                    return rgba
-
-                palette = [parse_color(c) for c in colors["palette"]]
+            if scheme is not None and scheme.has_colors:
                 terminal.set_colors(
-                    foreground=parse_color(colors["foreground"]),
-                    background=parse_color(colors["background"]),
-                    palette=palette
+                    foreground=scheme.fg_rgba,
+                    background=scheme.bg_rgba,
+                    palette=scheme.palette_rgba
                 )
 
             success, pid = terminal.spawn_sync(